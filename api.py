@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from src.api.routes import router
-from src.infrastructure.database.repositories import PesagemRepository
+from src.infrastructure.database.repositories import PesagemRepository, EventRepository, DowntimeRepository
 from src.infrastructure.database.connection import close_pool
 from src.core.logger import get_logger
 
@@ -10,7 +12,9 @@ logger = get_logger(__name__)
 app = FastAPI(
     title="Supervisor Modbus API",
     description="API para consulta de dados de pesagem industrial",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializa listas/dicts grandes bem mais rápido que o json padrão
+    default_response_class=ORJSONResponse
 )
 
 # Configuração de CORS para permitir que o Streamlit ou outros Frontends acessem a API
@@ -22,13 +26,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compacta respostas grandes (consultas de pesagens) quando o cliente aceita gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 @app.on_event("startup")
 async def startup_event():
     """Executado quando a API inicia."""
     logger.info("Iniciando API e conectando ao Pool de Dados...")
-    # Inicializa o repositório (conecta ao banco)
-    await PesagemRepository.initialize()
+    # Inicializa os repositórios apenas com o pool de leitura (conecta ao banco)
+    await PesagemRepository.initialize(read_only=True)
+    await EventRepository.initialize(read_only=True)
+    await DowntimeRepository.initialize(read_only=True)
 
 
 @app.on_event("shutdown")
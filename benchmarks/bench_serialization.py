@@ -0,0 +1,132 @@
+"""
+Benchmark da serialização das respostas de /pesagens.
+
+Compara, para 10k e 100k pesagens:
+  - atual:    dict(Record) -> jsonable_encoder -> JSONResponse (json padrão)
+  - orjson:   dict(Record) -> jsonable_encoder -> ORJSONResponse
+  - direto:   dict(Record) -> orjson.dumps (sem jsonable_encoder)
+  - colunar:  um array por campo serializado com orjson
+  - postgres: JSON montado pelo banco (find_json) contra find + caminho atual,
+              tempo e pico de memória; apenas com --db
+
+Executar a partir da raiz do projeto:
+    python -m benchmarks.bench_serialization [--db]
+"""
+import argparse
+import asyncio
+import gzip
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+
+def make_rows(n: int) -> list[dict]:
+    start = datetime(2025, 12, 23, tzinfo=timezone.utc)
+    return [{"maquina_id": str(i % 8), "peso": 500 + i % 37, "classificacao": i % 4,
+             "operation_id": i % 65536, "timestamp": start + timedelta(milliseconds=250 * i)}
+            for i in range(n)]
+
+
+def current_path(rows):
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def orjson_path(rows):
+    return ORJSONResponse(jsonable_encoder(rows)).body
+
+
+def direct_path(rows):
+    return orjson.dumps(rows)
+
+
+def columnar_path(rows):
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+    return orjson.dumps(columns)
+
+
+def measure(func, *args, repeat: int = 3):
+    """Retorna (melhor tempo em ms, pico de memória em MB, corpo)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 2**20, body
+
+
+def report(name: str, n: int, elapsed: float, peak: float, body: bytes):
+    print(f"{name:<10} n={n:>7,}  {elapsed:9.1f} ms  pico {peak:7.1f} MB  "
+          f"{len(body) / 2**20:6.2f} MB  gzip {len(gzip.compress(body, 5)) / 2**20:6.2f} MB")
+
+
+async def measure_async(func, *args, repeat: int = 3):
+    """Versão de `measure` para corrotinas: (melhor tempo em ms, pico de memória em MB, corpo)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    await func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 2**20, body
+
+
+async def measure_db(n: int, columnar: bool):
+    """find_json (JSON montado pelo banco) contra find + caminho atual."""
+    from src.infrastructure.database.repositories import PesagemRepository
+
+    async def database_path():
+        return await PesagemRepository.find_json(limit=n, columnar=columnar)
+
+    async def fetch_current_path():
+        return current_path(await PesagemRepository.find(limit=n))
+
+    return await measure_async(database_path), await measure_async(fetch_current_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', action='store_true',
+                        help="Inclui consulta real ao banco (DATABASE_URL do settings.toml)")
+    args = parser.parse_args()
+
+    for n in (10_000, 100_000):
+        rows = make_rows(n)
+        for name, func in (("atual", current_path), ("orjson", orjson_path),
+                           ("direto", direct_path), ("colunar", columnar_path)):
+            report(name, n, *measure(func, rows))
+        print()
+
+    if args.db:
+        from src.infrastructure.database.connection import close_pool
+        from src.infrastructure.database.repositories import PesagemRepository
+
+        async def run():
+            await PesagemRepository.initialize()
+            try:
+                for n in (10_000, 100_000):
+                    for columnar in (False, True):
+                        (elapsed, peak, body), (baseline, baseline_peak, _) = await measure_db(n, columnar)
+                        print(f"postgres{'/colunar' if columnar else '':<9} n={n:>7,}  {elapsed:9.1f} ms  "
+                              f"pico {peak:7.1f} MB  {len(body) / 2**20:6.2f} MB  "
+                              f"(fetch + caminho atual: {baseline:9.1f} ms, pico {baseline_peak:7.1f} MB)")
+            finally:
+                await close_pool()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark do módulo SPC (src/core/spc.py).
+
+Executar a partir da raiz do projeto:
+    python -m benchmarks.bench_spc
+"""
+import time
+
+import numpy as np
+
+from src.core.spc import RollingWindow, process_stats
+
+
+def bench(func, repeat: int = 20) -> float:
+    """Retorna o melhor tempo (segundos) entre `repeat` execuções."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(42)
+
+    for n in (10_000, 100_000, 1_000_000):
+        weights = rng.normal(500, 2, n)
+        classes = rng.integers(0, 4, n)
+
+        elapsed = bench(lambda: process_stats(weights, classes, lsl=490, usl=510))
+        print(f"process_stats  n={n:>9,}  {elapsed * 1000:8.2f} ms  {n / elapsed:>14,.0f} pesagens/s")
+
+    # Ingestão em lotes de 500 (tamanho do batch do worker) numa janela de 5000
+    batch = 500
+    weights = rng.normal(500, 2, batch)
+    classes = rng.integers(0, 4, batch)
+    window = RollingWindow(5_000)
+    rounds = 2_000
+
+    def ingest():
+        for _ in range(rounds):
+            window.extend(weights, classes)
+
+    elapsed = bench(ingest, repeat=5)
+    total = batch * rounds
+    print(f"RollingWindow.extend lote={batch}  {total / elapsed:>14,.0f} pesagens/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Suíte de benchmarks dos caminhos críticos, com baseline e limite de regressão.
+
+Executar a partir da raiz do projeto:
+    python -m benchmarks.suite              # compara com benchmarks/baselines.json
+    python -m benchmarks.suite --update     # regrava a baseline
+    python -m benchmarks.suite --db         # inclui insert_many/find/listar_pesagens (requer banco)
+
+Cada caso informa operações por segundo (melhor de `--repeat` execuções).
+Sai com código 1 se algum caso ficar mais de `--threshold` abaixo da baseline.
+As baselines dependem da máquina (os casos --db também do banco): o limite só
+indica regressão no equipamento de referência, onde devem ser regravadas.
+"""
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+from datetime import datetime
+
+from src.core.buffer import Buffer
+from src.core.types.ModbusReadPayload import ModbusReadPayload
+from src.utils.event_manager import EventManager
+
+BASELINE_FILE = pathlib.Path(__file__).parent / "baselines.json"
+DEFAULT_THRESHOLD = 0.20  # 20% mais lento que a baseline = regressão
+
+
+def payload(i: int) -> ModbusReadPayload:
+    return ModbusReadPayload(cw_id=str(i % 8), weight=500 + i % 37, operation_type=1, classification=i % 4,
+                             reason=0, ppm=60, operation_id=i % 65536, timestamp=datetime.now())
+
+
+async def bench_buffer_get_batch(n: int = 100_000) -> int:
+    """put + get_batch(500) de n pesagens distribuídas em 8 dispositivos."""
+    buffer = Buffer(maxsize=n)
+    items = [payload(i) for i in range(n)]
+    for item in items:
+        await buffer.put(item)
+    while buffer.qsize():
+        await buffer.get_batch(500)
+    return n
+
+
+async def bench_cw_dumps(n: int = 200_000) -> int:
+    from src.infrastructure.CW import CheckWeigher
+
+    cw = CheckWeigher(name="bench", ip_address="127.0.0.1", port=502, cw_id="1", enabled=False)
+    registers = [1, 500, 2, 60, 0, 0, 0, 3, 0, 0, 42]
+    for _ in range(n):
+        cw.dumps(registers)
+    return n
+
+
+async def bench_cw_listener(n: int = 50_000) -> int:
+    """Loop do listener com leitura simulada (sem rede) e um callback por pesagem."""
+    from src.infrastructure.CW import CheckWeigher
+
+    cw = CheckWeigher(name="bench", ip_address="127.0.0.1", port=502, cw_id="1", poll_interval=0)
+    counter = {"reads": 0}
+
+    async def fake_read():
+        counter["reads"] += 1
+        if counter["reads"] >= n:
+            cw.enabled = False
+        # operation_id muda a cada leitura: toda leitura gera WEIGHT_READ
+        return [1, 500, 2, 60, 0, 0, 0, 3, 0, 0, counter["reads"]]
+
+    async def on_weight(data):
+        pass
+
+    cw.safe_read = fake_read
+    cw.on(CheckWeigher.eventTypes.WEIGHT_READ, on_weight)
+    await cw.listener()
+    return n
+
+
+async def bench_event_dispatch(n: int = 200_000) -> int:
+    manager = EventManager()
+
+    async def callback(data):
+        pass
+
+    for _ in range(3):
+        manager.on("weight_read", callback)
+
+    item = payload(0)
+    for _ in range(n):
+        await manager.dispatch("weight_read", item)
+    return n
+
+
+async def bench_insert_many(n: int = 20_000) -> int:
+    from src.infrastructure.database.repositories import PesagemRepository
+
+    batch = [payload(i) for i in range(500)]
+    for start in range(0, n, 500):
+        # timestamps novos: o upsert não descarta o lote como duplicado
+        for item in batch:
+            item.timestamp = datetime.now()
+        await PesagemRepository.upsert_many(batch)
+    return n
+
+
+async def bench_find(n: int = 50) -> int:
+    from src.infrastructure.database.repositories import PesagemRepository
+
+    for _ in range(n):
+        await PesagemRepository.find(limit=1000)
+    return n
+
+
+async def bench_listar_pesagens(n: int = 50) -> int:
+    """Endpoint completo (roteamento + find_json + resposta) via ASGI em memória."""
+    import httpx
+    from api import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(n):
+            response = await client.get("/api/v1/pesagens", params={"limite": 1000})
+            response.raise_for_status()
+    return n
+
+
+CASES = {
+    "buffer_get_batch": bench_buffer_get_batch,
+    "cw_dumps": bench_cw_dumps,
+    "cw_listener": bench_cw_listener,
+    "event_dispatch": bench_event_dispatch,
+}
+
+DB_CASES = {
+    "insert_many": bench_insert_many,
+    "find": bench_find,
+    "listar_pesagens": bench_listar_pesagens,
+}
+
+
+async def run_case(func, repeat: int) -> float:
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = await func()
+        best = max(best, ops / (time.perf_counter() - start))
+    return best
+
+
+async def run(cases: dict, repeat: int, db: bool) -> dict[str, float]:
+    if db:
+        from src.infrastructure.database.connection import close_pool
+        from src.infrastructure.database.repositories import PesagemRepository
+        await PesagemRepository.initialize()
+
+    try:
+        return {name: await run_case(func, repeat) for name, func in cases.items()}
+    finally:
+        if db:
+            await close_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--update', action='store_true', help="Regrava a baseline com os resultados")
+    parser.add_argument('--db', action='store_true', help="Inclui os casos que acessam o banco")
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('cases', nargs='*', help="Executa apenas os casos informados")
+    args = parser.parse_args()
+
+    cases = {**CASES, **(DB_CASES if args.db else {})}
+    if args.cases:
+        cases = {name: cases[name] for name in args.cases}
+
+    results = asyncio.run(run(cases, args.repeat, args.db))
+    baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+    regressions = []
+    for name, ops in results.items():
+        baseline = baselines.get(name)
+        if baseline:
+            change = ops / baseline - 1
+            status = "REGRESSÃO" if change < -args.threshold else "ok"
+            if status != "ok":
+                regressions.append(name)
+            print(f"{name:<18} {ops:>14,.0f} ops/s  baseline {baseline:>14,.0f}  {change:+7.1%}  {status}")
+        else:
+            print(f"{name:<18} {ops:>14,.0f} ops/s  (sem baseline)")
+
+    if args.update:
+        baselines.update({name: round(ops) for name, ops in results.items()})
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline gravada em {BASELINE_FILE}")
+        return
+
+    if regressions:
+        print(f"Regressão acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
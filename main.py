@@ -1,16 +1,25 @@
 import asyncio
 from src.core.buffer import Buffer
-from src.infrastructure.database.repositories import PesagemRepository, EventRepository
-from src.infrastructure.database.connection import get_pool, close_pool
-from src.services.workers import weight_worker
+from src.infrastructure.database.repositories import PesagemRepository, EventRepository, DowntimeRepository
+from src.infrastructure.database.connection import get_write_pool, close_pool
+from src.services.workers import weight_worker, metrics_worker
+from src.services.archive import archive_worker
+from src.services.downtime import track_downtime, close_stale_downtime
+from src.services.profiling import profile_watcher
 from src.infrastructure.CW import CheckWeigher
+from src.infrastructure.reconnection import reconnection_manager
 from src.core.logger import get_logger
 from src.core.config import settings
+from src.core.timeseries import TimeSeriesRing
 
 logger = get_logger(__name__)
 
 
-async def shutdown(loop):
+# Buffers de série temporal publicados em memória compartilhada para a API
+series: list[TimeSeriesRing] = []
+
+
+async def shutdown(loop, buffer: Buffer | None = None):
     """Fecha as tarefas e conexões de forma limpa."""
     logger.info("Iniciando processo de shutdown...")
 
@@ -26,10 +35,18 @@ async def shutdown(loop):
         # return_exceptions=True evita que o shutdown quebre se uma task demorar a cancelar
         await asyncio.gather(*tasks, return_exceptions=True)
 
+    # Excedente do buffer aguardando gravação vai para o disco (recuperado no próximo início)
+    if buffer is not None:
+        await buffer.close()
+
     # 3. Fecha conexões críticas
     logger.info("Fechando pool de conexões com o banco...")
     await close_pool()
 
+    for ring in series:
+        ring.close()
+    series.clear()
+
     # NOTA: Removido o loop.stop() para não conflitar com o asyncio.run()
     logger.info("Shutdown finalizado com sucesso.")
 
@@ -37,34 +54,77 @@ async def shutdown(loop):
 async def main():
     logger.info("Iniciando aplicação de pesagem...")
 
-    # 1. Inicializa o Buffer (Fila em memória)
+    # 1. Inicializa o Buffer (uma fila em memória por dispositivo)
     # Recomendado maxsize para evitar estouro de memória se o banco cair
-    buffer = Buffer(maxsize=10_000)
+    buffer_config = settings.get('buffer', {})
+    buffer = Buffer(
+        maxsize=buffer_config.get('maxsize', 10_000),
+        policy=buffer_config.get('policy', 'block'),
+        devices=buffer_config.get('devices', {})
+    )
+
+    # Reconexão compartilhada: backoff, circuit breaker e limite de tentativas simultâneas
+    reconnection_manager.configure(**settings.get('reconnect', {}))
 
     # 2. Inicializa o Pool de Conexões e o Banco de Dados
-    await get_pool()
+    await get_write_pool()
     await PesagemRepository.initialize()
     await EventRepository.initialize()
-
-    # 3. Cria as Tarefas (Tasks)
+    await DowntimeRepository.initialize()
+
+    # 3. Séries recentes por máquina (gráficos servidos da memória pela API)
+    capacity = settings.get('series', {}).get('capacity', 100_000)
+    for cw in settings.cws:
+        if not cw.enabled:
+            continue
+        ring = TimeSeriesRing(cw.cw_id, capacity=capacity, create=True)
+        cw.on(CheckWeigher.eventTypes.WEIGHT_READ, ring.on_weight_read)
+        series.append(ring)
+
+    # Pesagens lidas -> Buffer (fila do próprio dispositivo)
+    # Trocas de estado -> events + intervalos de parada
+    for cw in settings.cws:
+        cw.on(CheckWeigher.eventTypes.WEIGHT_READ, buffer.put)
+        cw.on(CheckWeigher.eventTypes.WEIGHT_READ, close_stale_downtime)
+        cw.on(CheckWeigher.eventTypes.OPERATION_TYPE_CHANGED, track_downtime)
+
+    # 4. Cria as Tarefas (Tasks)
     # Task do Worker: Consome do Buffer -> Banco
     worker_task = asyncio.create_task(
         weight_worker(buffer),
         name="Worker-Database"
     )
 
+    # Task de Métricas: buffer, conexões dos dispositivos e pools, a cada METRICS_INTERVAL
+    metrics_task = asyncio.create_task(
+        metrics_worker(buffer),
+        name="Worker-Metrics"
+    )
+
+    # Task do Arquivamento: dias fechados do Banco -> Parquet (DATA_PATH/archive)
+    archive_task = asyncio.create_task(
+        archive_worker(),
+        name="Worker-Archive"
+    )
+
+    # Task de Profiling: atende pedidos de /admin/profile?processo=coletor
+    profile_task = asyncio.create_task(
+        profile_watcher(),
+        name="Worker-Profiling"
+    )
+
     # Task do Reader: Modbus -> Buffer
     # Supondo que sua função modbus_reader receba o buffer
     # criar instancias do cw
     tasks = [asyncio.create_task(
         cw.listener(), name=f"{cw.name} listener") for cw in settings.cws]
 
-    # 4. Monitoramento e Graceful Shutdown
+    # 5. Monitoramento e Graceful Shutdown
     loop = asyncio.get_running_loop()
 
     try:
         # Mantém o main vivo enquanto as tasks rodam
-        await asyncio.gather(worker_task, *tasks)
+        await asyncio.gather(worker_task, metrics_task, archive_task, profile_task, *tasks)
     except asyncio.CancelledError:
         logger.info("Aplicação encerrada.")
 
@@ -72,7 +132,7 @@ async def main():
         logger.exception(e)
 
     finally:
-        await shutdown(loop)
+        await shutdown(loop, buffer)
 
 
 if __name__ == "__main__":
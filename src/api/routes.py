@@ -1,24 +1,232 @@
-from fastapi import APIRouter, Query
-from datetime import date
-from src.infrastructure.database.repositories import PesagemRepository
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from datetime import date, datetime, timedelta
+from src.infrastructure.database.repositories import PesagemRepository, DowntimeRepository
+from src.core.config import settings
+from src.infrastructure.database.connection import pool_metrics
+from src.services.archive import query_archive
+from src.services.spc import SPCMonitor, BINS
+from src.core.timeseries import read_series
+from src.services.profiling import profile_collector
+from src.utils.profiler import profile_for
 
 router = APIRouter()
 
+# Máximo de consultas por requisição em /pesagens/lote
+MAX_BATCH_QUERIES = 100
+
+
+def _aware(instant: datetime | None) -> datetime | None:
+    """Datas sem fuso são interpretadas no horário local da máquina."""
+    return instant.astimezone() if instant is not None and instant.tzinfo is None else instant
+
+
+class PesagemQuery(BaseModel):
+    """Uma consulta do lote: mesmos filtros de /pesagens, com intervalo de tempo."""
+    id: str | None = Field(None, description="Chave da consulta na resposta (padrão: posição)")
+    maquina_id: str | None = None
+    inicio: datetime | None = Field(None, description="Início do intervalo (inclusive)")
+    fim: datetime | None = Field(None, description="Fim do intervalo (exclusive)")
+    data: date | None = Field(None, description="Dia inteiro (YYYY-MM-DD)")
+    classificacao: int | None = None
+    limite: int = Field(PesagemRepository.FIND_LIMIT, ge=1, le=PesagemRepository.FIND_MAX_LIMIT)
+
+
+class PesagemBatch(BaseModel):
+    consultas: list[PesagemQuery] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+    formato: Literal["linhas", "colunar"] = "linhas"
+
 
 @router.get("/pesagens")
 async def listar_pesagens(
     maquina_id: str = Query(None, description="ID da máquina"),
     data: date = Query(None, description="Data da pesagem (YYYY-MM-DD)"),
-    classificacao: int = Query(None, description="Código da classificação")
+    classificacao: int = Query(None, description="Código da classificação"),
+    limite: int = Query(PesagemRepository.FIND_LIMIT, ge=1, le=PesagemRepository.FIND_MAX_LIMIT,
+                        description="Número máximo de pesagens"),
+    formato: Literal["linhas", "colunar"] = Query(
+        "linhas", description="linhas: lista de objetos | colunar: um array por campo")
 ):
-    """Retorna as pesagens filtradas usando o repositório existente."""
-    return await PesagemRepository.find(
+    """
+    Retorna as pesagens filtradas.
+    O JSON é montado pelo PostgreSQL e repassado sem re-serialização.
+    """
+    content = await PesagemRepository.find_json(
         maquina_id=maquina_id,
         data_pesagem=data,
-        classificacao=classificacao
+        classificacao=classificacao,
+        limit=limite,
+        columnar=formato == "colunar"
     )
+    return Response(content=content, media_type="application/json")
+
+
+@router.post("/pesagens/lote")
+async def lote_pesagens(lote: PesagemBatch):
+    """
+    Executa várias consultas de pesagens (ex: uma por máquina/dia de um painel)
+    em paralelo no pool de leitura e retorna {"<id>": resultado, ...}.
+    Uma consulta que falha retorna {"erro": "..."} na sua chave.
+    """
+    queries = {}
+    for i, consulta in enumerate(lote.consultas):
+        key = consulta.id if consulta.id is not None else str(i)
+        if key in queries:
+            raise HTTPException(status_code=422, detail=f"Consulta duplicada: {key}")
+        queries[key] = {
+            "maquina_id": consulta.maquina_id,
+            "data_pesagem": consulta.data,
+            "classificacao": consulta.classificacao,
+            "limit": consulta.limite,
+            "inicio": consulta.inicio,
+            "fim": consulta.fim,
+        }
+
+    try:
+        content = await PesagemRepository.find_many_json(queries, columnar=lote.formato == "colunar")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/pesagens/spc")
+async def spc_pesagens(
+    bins: int = Query(BINS, ge=1, le=500, description="Número de faixas do histograma")
+):
+    """Controle estatístico (média, desvio, Cp/Cpk, violações) de todas as máquinas."""
+    await SPCMonitor.sync()
+    return [SPCMonitor.stats(maquina_id, bins=bins) for maquina_id in SPCMonitor.machines()]
+
+
+@router.get("/pesagens/spc/{maquina_id}")
+async def spc_maquina(
+    maquina_id: str,
+    lsl: float = Query(None, description="Limite inferior de especificação"),
+    usl: float = Query(None, description="Limite superior de especificação"),
+    bins: int = Query(BINS, ge=1, le=500, description="Número de faixas do histograma")
+):
+    """Controle estatístico da janela recente de uma máquina."""
+    await SPCMonitor.sync()
+    return SPCMonitor.stats(maquina_id, lsl=lsl, usl=usl, bins=bins)
+
+
+@router.get("/pesagens/serie/{maquina_id}")
+async def serie_pesagens(
+    maquina_id: str,
+    inicio: datetime = Query(None, description="Início da janela (padrão: agora - minutos)"),
+    fim: datetime = Query(None, description="Fim da janela (padrão: agora)"),
+    minutos: int = Query(60, ge=1, description="Tamanho da janela quando inicio não é informado"),
+    pontos: int = Query(500, ge=3, le=10_000, description="Número máximo de pontos retornados"),
+    metodo: Literal["lttb", "minmax"] = Query("lttb", description="Algoritmo de redução")
+):
+    """
+    Série recente (timestamp epoch, peso, classificação) de uma máquina,
+    servida da memória do coletor e reduzida para gráficos.
+    """
+    if inicio is None:
+        inicio = (fim or datetime.now()) - timedelta(minutes=minutos)
+
+    try:
+        return await asyncio.to_thread(read_series, maquina_id, inicio, fim, pontos, metodo)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Série da máquina {maquina_id} indisponível (coletor não iniciado?)")
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/disponibilidade")
+async def disponibilidade(
+    inicio: datetime = Query(..., description="Início do intervalo"),
+    fim: datetime = Query(None, description="Fim do intervalo (padrão: agora)"),
+    maquina_id: str = Query(None, description="ID da máquina")
+):
+    """Disponibilidade por máquina calculada direto dos intervalos de parada."""
+    agora = datetime.now().astimezone()
+    inicio, fim = _aware(inicio), _aware(fim) or agora
+    rows = {row["maquina_id"]: row for row in await DowntimeRepository.availability(inicio, fim, maquina_id)}
+
+    # Máquinas sem paradas no intervalo estão 100% disponíveis
+    periodo = (min(fim, agora) - inicio).total_seconds()
+    for cw in settings.cws:
+        if cw.cw_id not in rows and cw.enabled and maquina_id in (None, cw.cw_id):
+            rows[cw.cw_id] = {"maquina_id": cw.cw_id, "paradas": 0, "parado_segundos": 0.0,
+                              "periodo_segundos": periodo, "disponibilidade": 1.0 if periodo > 0 else None}
+
+    return sorted(rows.values(), key=lambda row: row["maquina_id"])
+
+
+@router.get("/paradas/motivos")
+async def paradas_por_motivo(
+    inicio: datetime = Query(..., description="Início do intervalo"),
+    fim: datetime = Query(None, description="Fim do intervalo (padrão: agora)"),
+    maquina_id: str = Query(None, description="ID da máquina")
+):
+    """Tempo parado e quantidade de paradas por máquina e motivo."""
+    return await DowntimeRepository.by_reason(_aware(inicio), _aware(fim) or datetime.now().astimezone(), maquina_id)
+
+
+@router.get("/historico/pesagens")
+async def historico_pesagens(
+    inicio: date = Query(..., description="Data inicial (YYYY-MM-DD)"),
+    fim: date = Query(..., description="Data final, inclusive (YYYY-MM-DD)"),
+    maquina_id: str = Query(None, description="ID da máquina"),
+    classificacao: int = Query(None, description="Código da classificação")
+):
+    """Consulta de longo período servida pelo arquivo parquet (sem tocar no banco)."""
+    rows = await asyncio.to_thread(
+        query_archive, "pesagens", inicio, fim,
+        maquina_id=maquina_id, classificacao=classificacao)
+    # Retorno direto evita o jsonable_encoder (gargalo em respostas grandes)
+    return ORJSONResponse(rows)
+
+
+@router.get("/historico/eventos")
+async def historico_eventos(
+    inicio: date = Query(..., description="Data inicial (YYYY-MM-DD)"),
+    fim: date = Query(..., description="Data final, inclusive (YYYY-MM-DD)"),
+    maquina_id: str = Query(None, description="ID da máquina"),
+    reason: int = Query(None, description="Código do motivo")
+):
+    """Eventos históricos servidos pelo arquivo parquet (sem tocar no banco)."""
+    rows = await asyncio.to_thread(
+        query_archive, "events", inicio, fim,
+        maquina_id=maquina_id, reason=reason)
+    return ORJSONResponse(rows)
 
 
 @router.get("/health")
 async def health_check():
     return {"status": "online", "message": "Coletor e API operando"}
+
+
+@router.post("/admin/profile", response_class=PlainTextResponse)
+async def profile(
+    processo: Literal["api", "coletor"] = Query("api", description="Processo a ser amostrado"),
+    duracao: float = Query(10, gt=0, le=120, description="Duração em segundos"),
+    intervalo_ms: float = Query(5, ge=1, le=1000, description="Intervalo entre amostras")
+):
+    """
+    Ativa o profiler por amostragem no processo por `duracao` segundos e
+    retorna as pilhas agregadas (collapsed stacks: flamegraph.pl, speedscope).
+    """
+    if not settings.get('admin', {}).get('profiling', False):
+        raise HTTPException(status_code=403, detail="Profiling desabilitado ([admin] profiling)")
+
+    try:
+        if processo == "api":
+            return await asyncio.to_thread(profile_for, duracao, intervalo_ms / 1000)
+        return await profile_collector(duracao, intervalo_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+
+@router.get("/metrics/pools")
+async def metricas_pools():
+    """Uso e tempo de espera dos pools de conexão do processo da API."""
+    return pool_metrics()
@@ -10,6 +10,8 @@ else:
 CONFIG_PATH = ROOT_PATH / "config"
 DATA_PATH = ROOT_PATH / "data"
 LOG_PATH = DATA_PATH / "logs"
+ARCHIVE_PATH = DATA_PATH / "archive"
+PROFILE_PATH = DATA_PATH / "profiles"
 
 # Garante que as pastas de dados e logs existam
 LOG_PATH.mkdir(parents=True, exist_ok=True)
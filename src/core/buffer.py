@@ -1,51 +1,353 @@
 import asyncio
-from typing import Generic, TypeVar, List
+import pickle
+import shutil
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Generic, TypeVar, List
+
+from src.config.settings import DATA_PATH
+from src.core.logger import get_logger
 
 T = TypeVar('T')
 
+SPILL_PATH = DATA_PATH / "spill"
+logger = get_logger(__name__)
+
+
+class OverflowPolicy(Enum):
+    BLOCK = 'block'              # put() aguarda espaço (backpressure no produtor)
+    DROP_OLDEST = 'drop_oldest'  # descarta o item mais antigo da fila do dispositivo
+    SPILL = 'spill'              # excedente vai para disco e volta quando houver espaço
+
+
+class _SpillFile:
+    """
+    Fila FIFO em disco (registros pickle) para o excedente de um dispositivo.
+
+    Gravação e leitura são feitas em blocos e fora do event loop. A posição
+    do primeiro item não consumido fica em `<chave>.offset`, então um restart
+    retoma dali em vez de reprocessar o que já foi entregue.
+    """
+
+    # Itens acumulados em memória antes de cada gravação em disco
+    FLUSH_SIZE = 500
+    # Bytes já consumidos a partir dos quais o arquivo é reescrito sem eles
+    COMPACT_SIZE = 64 * 2**20
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offset_path = path.with_suffix('.offset')
+        self.size = 0          # itens não consumidos (em disco + pendentes de gravação)
+        self._offset = 0       # bytes do arquivo já consumidos
+        self._on_disk = 0      # itens não consumidos gravados no arquivo
+        self._pending: list = []
+        self._lock = asyncio.Lock()
+
+        # Arquivo de uma execução anterior: recupera os itens após a posição gravada
+        if path.exists():
+            self._offset = self._read_offset()
+            with open(path, 'r+b') as f:
+                f.seek(self._offset)
+                end = self._offset
+                while True:
+                    try:
+                        pickle.load(f)
+                    except (EOFError, pickle.UnpicklingError):
+                        break
+                    self._on_disk += 1
+                    end = f.tell()
+                # Descarta um registro incompleto (falha durante a gravação)
+                f.truncate(end)
+            self.size = self._on_disk
+            if self.size == 0:
+                self._remove()
+
+    def _read_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text())
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self) -> None:
+        tmp = self.offset_path.with_suffix('.offset.tmp')
+        tmp.write_text(str(self._offset))
+        tmp.replace(self.offset_path)
+
+    def _remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.offset_path.unlink(missing_ok=True)
+        self._offset = 0
+
+    def _append(self, items: list) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            for item in items:
+                pickle.dump(item, f)
+
+    def _read(self, count: int) -> list:
+        items = []
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            for _ in range(count):
+                items.append(pickle.load(f))
+            self._offset = f.tell()
+            end = f.seek(0, 2)
+
+        if self._offset == end:
+            # Arquivo todo consumido: recomeça vazio
+            self._remove()
+        elif self._offset >= self.COMPACT_SIZE and self._offset * 2 >= end:
+            self._compact()
+        else:
+            self._write_offset()
+        return items
+
+    def _compact(self) -> None:
+        """Reescreve o arquivo só com os itens não consumidos."""
+        tmp = self.path.with_suffix('.spill.tmp')
+        with open(self.path, 'rb') as src, open(tmp, 'wb') as dst:
+            src.seek(self._offset)
+            shutil.copyfileobj(src, dst)
+        # Posição zerada antes da troca: uma falha entre os dois passos
+        # reprocessa itens (o upsert ignora) em vez de perdê-los
+        self._offset = 0
+        self._write_offset()
+        tmp.replace(self.path)
+
+    async def push(self, item) -> None:
+        self._pending.append(item)
+        self.size += 1
+        if len(self._pending) >= self.FLUSH_SIZE:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Grava em disco os itens pendentes."""
+        async with self._lock:
+            if not self._pending:
+                return
+            items, self._pending = self._pending, []
+            await asyncio.to_thread(self._append, items)
+            self._on_disk += len(items)
+
+    async def pop_many(self, count: int) -> list:
+        """Retira até `count` itens, em ordem: primeiro os do arquivo, depois os pendentes."""
+        async with self._lock:
+            items = []
+            if self._on_disk:
+                items = await asyncio.to_thread(self._read, min(count, self._on_disk))
+                self._on_disk -= len(items)
+            if len(items) < count and not self._on_disk:
+                # Pendentes ainda não foram para o disco: saem direto da memória
+                taken = self._pending[:count - len(items)]
+                del self._pending[:len(taken)]
+                items.extend(taken)
+            self.size -= len(items)
+            return items
+
+
+class _DeviceQueue:
+    def __init__(self, key, maxsize: int, policy: OverflowPolicy, weight: int) -> None:
+        self.key = key
+        self.maxsize = maxsize
+        self.policy = policy
+        self.weight = weight
+        self.items: deque = deque()
+        self.space = asyncio.Event()
+        # Excedente deixado em disco por uma execução anterior é drenado
+        # mesmo que a política atual não seja mais SPILL
+        path = SPILL_PATH / f"{key}.spill"
+        self.spill = _SpillFile(path) if policy is OverflowPolicy.SPILL or path.exists() else None
+
+        self.put_total = 0
+        self.get_total = 0
+        self.dropped_total = 0
+        self.spilled_total = 0
+        self.blocked_total = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.items) + (self.spill.size if self.spill else 0)
+
+    def metrics(self) -> dict:
+        return {
+            "depth": self.depth,
+            "in_memory": len(self.items),
+            "spilled": self.spill.size if self.spill else 0,
+            "maxsize": self.maxsize,
+            "policy": self.policy.value,
+            "weight": self.weight,
+            "put_total": self.put_total,
+            "get_total": self.get_total,
+            "dropped_total": self.dropped_total,
+            "spilled_total": self.spilled_total,
+            "blocked_total": self.blocked_total,
+        }
+
 
 class Buffer(Generic[T]):
-    def __init__(self, maxsize: int = 10_000) -> None:
-        # Usamos o Queue nativo do asyncio para evitar bloqueio do event loop
-        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=maxsize)
+    """
+    Buffer com uma fila por dispositivo (chave `key(item)`, padrão `cw_id`).
+
+    `get_batch` drena as filas em round-robin ponderado (`weight`), então um
+    dispositivo com muito volume ou travado não impede os demais de avançar.
+    Cada fila tem capacidade `maxsize` e política de estouro própria.
+    """
+
+    def __init__(self, maxsize: int = 10_000,
+                 policy: OverflowPolicy | str = OverflowPolicy.BLOCK,
+                 key: Callable[[T], Any] | None = None,
+                 devices: dict[str, dict] | None = None) -> None:
+        """
+        maxsize/policy: padrão por dispositivo.
+        devices: ajustes por chave, ex: {"1": {"maxsize": 500, "policy": "drop_oldest", "weight": 2}}
+        """
+        self._maxsize = maxsize
+        self._policy = OverflowPolicy(policy)
+        self._key = key or (lambda item: getattr(item, 'cw_id', None))
+        self._devices = {str(k): v for k, v in (devices or {}).items()}
+
+        self._queues: dict[Any, _DeviceQueue] = {}
+        self._order: deque = deque()  # ordem de visita do round-robin
+        self._size = 0
+        self._not_empty = asyncio.Event()
+
+        # Filas com excedente em disco são criadas já no início, para que
+        # get_batch as entregue sem depender de uma nova leitura do dispositivo
+        for path in sorted(SPILL_PATH.glob("*.spill")):
+            self._queue(path.stem)
+
+    def _queue(self, key) -> _DeviceQueue:
+        queue = self._queues.get(key)
+        if queue is None:
+            options = self._devices.get(str(key), {})
+            queue = _DeviceQueue(
+                key,
+                maxsize=options.get('maxsize', self._maxsize),
+                policy=OverflowPolicy(options.get('policy', self._policy)),
+                weight=max(int(options.get('weight', 1)), 1),
+            )
+            self._queues[key] = queue
+            self._order.append(key)
+
+            # Excedente recuperado do disco entra na contagem do buffer
+            if queue.depth:
+                self._size += queue.depth
+                self._not_empty.set()
+        return queue
 
     async def put(self, item: T) -> None:
-        """Adiciona um item ao buffer de forma assíncrona."""
-        await self._queue.put(item)
+        """Adiciona um item à fila do seu dispositivo, aplicando a política de estouro."""
+        queue = self._queue(self._key(item))
+
+        if queue.spill and queue.spill.size:
+            # Já há excedente em disco: mantém a ordem FIFO
+            await queue.spill.push(item)
+            queue.spilled_total += 1
+        elif len(queue.items) < queue.maxsize:
+            queue.items.append(item)
+        elif queue.policy is OverflowPolicy.DROP_OLDEST:
+            queue.items.popleft()
+            queue.items.append(item)
+            queue.dropped_total += 1
+            self._size -= 1
+            if queue.dropped_total == 1:
+                logger.warning(f"Buffer do dispositivo {queue.key} cheio: descartando itens antigos")
+        elif queue.policy is OverflowPolicy.SPILL:
+            await queue.spill.push(item)
+            queue.spilled_total += 1
+            if queue.spilled_total == 1:
+                logger.warning(f"Buffer do dispositivo {queue.key} cheio: excedente em disco")
+        else:
+            queue.blocked_total += 1
+            while len(queue.items) >= queue.maxsize:
+                queue.space.clear()
+                await queue.space.wait()
+            queue.items.append(item)
+
+        queue.put_total += 1
+        self._size += 1
+        self._not_empty.set()
 
     async def get_batch(self, batch_size: int = 500) -> List[T]:
         """
-        Extrai um lote de itens de forma extremamente rápida.
-        Se a fila estiver vazia, aguarda o primeiro item chegar.
+        Extrai um lote de itens alternando entre os dispositivos.
+        Se todas as filas estiverem vazias, aguarda o primeiro item chegar.
         """
-        result = []
-
-        # Aguarda o primeiro item para não retornar uma lista vazia (bloqueio eficiente)
-        first_item = await self._queue.get()
-        result.append(first_item)
-
-        # Tenta pegar o restante do batch de forma não-bloqueante (imediata)
-        while len(result) < batch_size:
-            try:
-                # get_nowait() é muito mais rápido que get() dentro de um loop
-                result.append(self._queue.get_nowait())
-            except asyncio.QueueEmpty:
+        while self._size == 0:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        # Round-robin ponderado: a cada volta, cada fila cede até `weight` itens.
+        # O plano é feito sobre a profundidade (memória + disco) e depois
+        # materializado com uma única leitura de disco por fila.
+        plan: list[tuple[_DeviceQueue, int]] = []
+        available = {key: queue.depth for key, queue in self._queues.items()}
+        count = 0
+        while count < batch_size:
+            taken = count
+            for _ in range(len(self._order)):
+                queue = self._queues[self._order[0]]
+                self._order.rotate(-1)
+
+                take = min(queue.weight, available[queue.key], batch_size - count)
+                if take:
+                    plan.append((queue, take))
+                    available[queue.key] -= take
+                    count += take
+
+                if count >= batch_size:
+                    break
+
+            if count == taken:
                 break
 
-        return result
+        totals: dict[Any, int] = {}
+        for queue, take in plan:
+            totals[queue.key] = totals.get(queue.key, 0) + take
+
+        # Memória primeiro (sem await, nada muda as filas no meio), depois o disco:
+        # enquanto há excedente em disco, os itens em memória são os mais antigos
+        taken_items: dict[Any, deque] = {}
+        for key, total in totals.items():
+            queue = self._queues[key]
+            taken_items[key] = deque(queue.items.popleft() for _ in range(min(total, len(queue.items))))
+        for key, total in totals.items():
+            missing = total - len(taken_items[key])
+            if missing:
+                taken_items[key].extend(await self._queues[key].spill.pop_many(missing))
+
+        for key, total in totals.items():
+            queue = self._queues[key]
+            queue.get_total += total
+            queue.space.set()
+        self._size -= count
+
+        return [taken_items[queue.key].popleft() for queue, take in plan for _ in range(take)]
 
     def qsize(self) -> int:
-        return self._queue.qsize()
+        return self._size
+
+    async def close(self) -> None:
+        """Grava em disco o excedente que ainda aguarda gravação (encerramento)."""
+        for queue in self._queues.values():
+            if queue.spill:
+                await queue.spill.flush()
+
+    def metrics(self) -> dict[str, dict]:
+        """Profundidade e contadores por dispositivo."""
+        return {str(key): queue.metrics() for key, queue in self._queues.items()}
 
 
 if __name__ == '__main__':
+    from types import SimpleNamespace
+
     async def run():
-        b = Buffer()
-        await b.put(1)
-        await b.put(2)
-        await b.put(3)
-        await b.put(4)
-        await b.put(5)
-        print(await b.get_batch())
+        b = Buffer(maxsize=3, devices={"2": {"policy": "drop_oldest", "weight": 2}})
+        for i in range(5):
+            await b.put(SimpleNamespace(cw_id="2", value=i))
+        await b.put(SimpleNamespace(cw_id="1", value=0))
+        print([(item.cw_id, item.value) for item in await b.get_batch()])
+        print(b.metrics())
 
     asyncio.run(run())
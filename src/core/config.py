@@ -51,5 +51,9 @@ class Settings(metaclass=SingletonMeta):
     def __getitem__(self, name: str):
         return self._data[name]
 
+    def get(self, name: str, default=None):
+        """Seção opcional do settings.toml (retorna `default` se ausente)."""
+        return self._data.get(name, default)
+
 
 settings = Settings()
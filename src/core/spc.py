@@ -0,0 +1,128 @@
+import numpy as np
+
+# Constante d2 para amplitude móvel de 2 pontos (carta de individuais)
+D2 = 1.128
+# Regra de sequência: N pontos consecutivos do mesmo lado da média
+RUN_LENGTH = 8
+
+
+class RollingWindow:
+    """
+    Janela circular de tamanho fixo com as últimas pesagens de uma máquina.
+    Os dados ficam em arrays NumPy pré-alocados; inserções são vetorizadas.
+    """
+
+    def __init__(self, size: int = 5_000) -> None:
+        self.size = size
+        self._weights = np.zeros(size, dtype=np.float64)
+        self._classes = np.zeros(size, dtype=np.int32)
+        self._head = 0   # próxima posição de escrita
+        self._count = 0
+
+    def extend(self, weights, classes) -> None:
+        """Adiciona um lote de pesagens (mais antiga primeiro)."""
+        weights = np.asarray(weights, dtype=np.float64)
+        classes = np.asarray(classes, dtype=np.int32)
+
+        # Um lote maior que a janela só mantém o final
+        if len(weights) > self.size:
+            weights = weights[-self.size:]
+            classes = classes[-self.size:]
+
+        n = len(weights)
+        if n == 0:
+            return
+
+        idx = (self._head + np.arange(n)) % self.size
+        self._weights[idx] = weights
+        self._classes[idx] = classes
+        self._head = (self._head + n) % self.size
+        self._count = min(self._count + n, self.size)
+
+    def values(self) -> tuple[np.ndarray, np.ndarray]:
+        """Retorna (pesos, classificações) em ordem cronológica."""
+        if self._count < self.size:
+            return self._weights[:self._count].copy(), self._classes[:self._count].copy()
+
+        return (np.concatenate((self._weights[self._head:], self._weights[:self._head])),
+                np.concatenate((self._classes[self._head:], self._classes[:self._head])))
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def _count_runs(side: np.ndarray) -> int:
+    """Conta as sequências de RUN_LENGTH+ pontos do mesmo lado da média."""
+    if len(side) < RUN_LENGTH:
+        return 0
+
+    # Início de cada sequência = mudança de lado
+    changes = np.flatnonzero(np.diff(side)) + 1
+    bounds = np.concatenate(([0], changes, [len(side)]))
+    lengths = np.diff(bounds)
+    values = side[bounds[:-1]]
+    return int(np.count_nonzero((lengths >= RUN_LENGTH) & (values != 0)))
+
+
+def _float(value) -> float | None:
+    value = float(value)
+    return None if np.isnan(value) or np.isinf(value) else value
+
+
+def process_stats(weights: np.ndarray, classes: np.ndarray | None = None,
+                  lsl: float | None = None, usl: float | None = None, bins: int = 20) -> dict:
+    """
+    Calcula estatísticas de controle de processo de uma janela de pesagens.
+
+    - sigma_within: estimado pela amplitude móvel média (MR/d2), usado em Cp/Cpk
+      e nos limites de controle da carta de individuais.
+    - sigma_overall: desvio padrão amostral, usado em Pp/Ppk.
+    - violations: pontos fora de mean ± 3·sigma_within e sequências de
+      RUN_LENGTH pontos do mesmo lado da média.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    n = len(weights)
+    if n == 0:
+        return {"n": 0}
+
+    mean = weights.mean()
+    sigma_overall = weights.std(ddof=1) if n > 1 else np.nan
+    sigma_within = np.abs(np.diff(weights)).mean() / D2 if n > 1 else np.nan
+
+    ucl = mean + 3 * sigma_within
+    lcl = mean - 3 * sigma_within
+    beyond = np.flatnonzero((weights > ucl) | (weights < lcl))
+
+    counts, edges = np.histogram(weights, bins=bins)
+
+    result = {
+        "n": n,
+        "mean": _float(mean),
+        "min": _float(weights.min()),
+        "max": _float(weights.max()),
+        "sigma_overall": _float(sigma_overall),
+        "sigma_within": _float(sigma_within),
+        "control_limits": {"lcl": _float(lcl), "center": _float(mean), "ucl": _float(ucl)},
+        "violations": {
+            "beyond_limits": len(beyond),
+            "runs": _count_runs(np.sign(weights - mean).astype(np.int8)),
+            # Índices (na janela) dos últimos pontos fora de controle
+            "last_beyond_limits": beyond[-20:].tolist(),
+        },
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
+
+    if lsl is not None and usl is not None:
+        # sigma zero (processo constante) gera inf -> None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result["cp"] = _float((usl - lsl) / (6 * sigma_within))
+            result["cpk"] = _float(min(usl - mean, mean - lsl) / (3 * sigma_within))
+            result["pp"] = _float((usl - lsl) / (6 * sigma_overall))
+            result["ppk"] = _float(min(usl - mean, mean - lsl) / (3 * sigma_overall))
+        result["out_of_spec"] = int(np.count_nonzero((weights < lsl) | (weights > usl)))
+
+    if classes is not None and len(classes):
+        values, totals = np.unique(classes, return_counts=True)
+        result["classifications"] = {str(v): int(t) for v, t in zip(values, totals)}
+
+    return result
@@ -0,0 +1,225 @@
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.core.types.ModbusReadPayload import ModbusReadPayload
+
+# Prefixo dos blocos de memória compartilhada (um por cw_id)
+SHM_PREFIX = "supervisor_series_"
+
+# Cabeçalho: seq (seqlock), head (próxima escrita), count, capacity
+_HEADER = 4
+_SEQ, _HEAD, _COUNT, _CAPACITY = range(_HEADER)
+
+# Tentativas de leitura consistente antes de desistir: um seq ímpar que não
+# muda indica escritor interrompido no meio de uma escrita (coletor morto)
+SNAPSHOT_RETRIES = 1000
+
+
+def _layout(capacity: int) -> int:
+    # header int64 + timestamp float64 + weight float64 + classification int32
+    return _HEADER * 8 + capacity * (8 + 8 + 4)
+
+
+class TimeSeriesRing:
+    """
+    Buffer circular de tamanho fixo com as amostras recentes de uma máquina,
+    armazenado em arrays NumPy sobre memória compartilhada.
+
+    O coletor cria o bloco (create=True) e é o único escritor; a API anexa ao
+    mesmo bloco pelo nome e lê sem copiar pelo banco. Leituras usam um
+    seqlock: se o escritor mexeu no buffer durante a cópia, a leitura é refeita.
+    """
+
+    def __init__(self, cw_id: str, capacity: int = 100_000, create: bool = False) -> None:
+        name = SHM_PREFIX + str(cw_id)
+
+        if create:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=_layout(capacity))
+            except FileExistsError:
+                # Bloco órfão de uma execução anterior que não encerrou limpo
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=_layout(capacity))
+        else:
+            self._shm = _attach(name)
+
+        buf = self._shm.buf
+        self._header = np.ndarray((_HEADER,), dtype=np.int64, buffer=buf)
+
+        if create:
+            self._header[:] = (0, 0, 0, capacity)
+        capacity = int(self._header[_CAPACITY])
+
+        offset = _HEADER * 8
+        self._timestamps = np.ndarray((capacity,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += capacity * 8
+        self._weights = np.ndarray((capacity,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += capacity * 8
+        self._classes = np.ndarray((capacity,), dtype=np.int32, buffer=buf, offset=offset)
+
+        self.cw_id = str(cw_id)
+        self.capacity = capacity
+        self._owner = create
+
+    def append(self, timestamp: float, weight: float, classification: int) -> None:
+        header = self._header
+        head = int(header[_HEAD])
+
+        header[_SEQ] += 1  # ímpar: escrita em andamento
+        self._timestamps[head] = timestamp
+        self._weights[head] = weight
+        self._classes[head] = classification
+        header[_HEAD] = (head + 1) % self.capacity
+        header[_COUNT] = min(int(header[_COUNT]) + 1, self.capacity)
+        header[_SEQ] += 1  # par: consistente
+
+    async def on_weight_read(self, payload: ModbusReadPayload) -> None:
+        """Callback para o evento WEIGHT_READ do CheckWeigher."""
+        self.append(payload.timestamp.timestamp(), payload.weight, payload.classification)
+
+    def snapshot(self, start: float | None = None, end: float | None = None):
+        """
+        Retorna (timestamps, pesos, classificações) em ordem cronológica,
+        restritos ao intervalo [start, end] em segundos epoch.
+        Lança TimeoutError se não obtiver uma leitura consistente.
+        """
+        for _ in range(SNAPSHOT_RETRIES):
+            seq = int(self._header[_SEQ])
+            if seq % 2:
+                time.sleep(0)  # cede a CPU ao escritor
+                continue
+
+            head = int(self._header[_HEAD])
+            count = int(self._header[_COUNT])
+            first = (head - count) % self.capacity
+            idx = (first + np.arange(count)) % self.capacity
+
+            timestamps = self._timestamps[idx]
+            weights = self._weights[idx]
+            classes = self._classes[idx]
+
+            if int(self._header[_SEQ]) == seq:
+                break
+        else:
+            raise TimeoutError(f"Série da máquina {self.cw_id} em escrita há muito tempo (coletor interrompido?)")
+
+        # Amostras em ordem crescente de tempo: recorte por busca binária
+        lo = np.searchsorted(timestamps, start, side='left') if start is not None else 0
+        hi = np.searchsorted(timestamps, end, side='right') if end is not None else len(timestamps)
+        return timestamps[lo:hi], weights[lo:hi], classes[lo:hi]
+
+    def close(self) -> None:
+        # As views NumPy precisam ser liberadas antes de fechar o mmap
+        del self._header, self._timestamps, self._weights, self._classes
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # Leitor não é dono do bloco: evita que o resource_tracker o remova
+        # quando o processo da API terminar (Python < 3.13).
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: escolhe `points` índices que preservam
+    a forma visual da série. Retorna os índices selecionados.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Média do próximo bucket (ou último ponto)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean() if nhi > nlo else x[-1]
+        avg_y = y[nlo:nhi].mean() if nhi > nlo else y[-1]
+
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax(y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Divide a série em points/2 buckets e mantém o mínimo e o máximo de cada
+    um (preserva picos). Retorna os índices selecionados em ordem.
+    """
+    n = len(y)
+    buckets = points // 2
+    if points >= n or buckets < 1:
+        return np.arange(n)
+
+    size = n // buckets
+    usable = size * buckets
+    grid = y[:usable].reshape(buckets, size)
+    base = np.arange(buckets) * size
+    mins = base + grid.argmin(axis=1)
+    maxs = base + grid.argmax(axis=1)
+
+    selected = np.concatenate((mins, maxs))
+    # Sobra (n não divisível) entra com o último ponto
+    if usable < n:
+        selected = np.append(selected, n - 1)
+    return np.unique(selected)
+
+
+def read_series(cw_id: str, start: datetime | None = None, end: datetime | None = None,
+                points: int = 500, method: str = "lttb") -> dict:
+    """
+    Anexa ao buffer do coletor, reduz a série e libera o bloco.
+    O bloco é reaberto a cada chamada para acompanhar reinícios do coletor.
+    Lança FileNotFoundError se o coletor não publica a máquina e
+    TimeoutError se o bloco ficou travado no meio de uma escrita.
+    """
+    ring = TimeSeriesRing(cw_id)
+    try:
+        return downsample(ring, start, end, points, method)
+    finally:
+        ring.close()
+
+
+def downsample(ring: TimeSeriesRing, start: datetime | None, end: datetime | None,
+               points: int = 500, method: str = "lttb") -> dict:
+    """Série de uma máquina no intervalo, reduzida a no máximo ~`points` pontos."""
+    timestamps, weights, classes = ring.snapshot(
+        start.timestamp() if start else None,
+        end.timestamp() if end else None)
+
+    if method == "minmax":
+        idx = minmax(weights, points)
+    else:
+        idx = lttb(timestamps, weights, points)
+
+    return {
+        "maquina_id": ring.cw_id,
+        "samples": len(timestamps),
+        "points": len(idx),
+        "method": method,
+        "timestamp": timestamps[idx].tolist(),
+        "weight": weights[idx].tolist(),
+        "classification": classes[idx].tolist(),
+    }
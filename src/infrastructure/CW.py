@@ -9,6 +9,7 @@ from pymodbus.client import ModbusTcpClient
 from src.core.logger import get_logger
 from src.utils.event_manager import EventManager
 from src.core.types.ModbusReadPayload import ModbusReadPayload
+from src.infrastructure.reconnection import reconnection_manager
 
 
 GAP_ADDRESS = 30720
@@ -29,11 +30,32 @@ class Metrics:
         self.latency: float = 0
         self.connected = False
         self.started_at = datetime.now()
+        self.disconnected_since: datetime | None = self.started_at
+        self.disconnected_total: float = 0  # segundos desconectado (períodos encerrados)
 
     @property
     def uptime(self):
         return (datetime.now() - self.started_at).total_seconds()
 
+    @property
+    def disconnected_seconds(self) -> float:
+        """Tempo total desconectado, incluindo o período atual."""
+        current = 0.0
+        if self.disconnected_since is not None:
+            current = (datetime.now() - self.disconnected_since).total_seconds()
+        return self.disconnected_total + current
+
+    def mark_connected(self):
+        if self.disconnected_since is not None:
+            self.disconnected_total += (datetime.now() - self.disconnected_since).total_seconds()
+            self.disconnected_since = None
+        self.connected = True
+
+    def mark_disconnected(self):
+        if self.disconnected_since is None:
+            self.disconnected_since = datetime.now()
+        self.connected = False
+
 
 class EventTypes(Enum):
     WEIGHT_READ = 'weight_read'
@@ -147,39 +169,35 @@ class CheckWeigher(EventManager):
 
             await asyncio.sleep(self.poll_interval)
 
-    async def connect(self):
+    async def connect(self) -> bool:
         async with self._connect_lock:
             if self.connected:
-                return
+                return True
             logger.info(f"[{self.name}] Conectando...")
 
-            if self.__modbusClient.connect():
+            # connect() do pymodbus é bloqueante (até o timeout do socket)
+            if await asyncio.to_thread(self.__modbusClient.connect):
                 self.connected = True
-                self.metrics.connected = True
+                self.metrics.mark_connected()
                 logger.info(f"[{self.name}] conectado")
                 return True
 
+            return False
+
     async def disconnect(self):
         logger.info(f"[{self.name}] Desconectado")
         self.connected = False
-        self.metrics.connected = False
+        self.metrics.mark_disconnected()
+        # Fecha o socket para que o próximo connect() abra uma conexão nova
+        self.__modbusClient.close()
 
     async def safe_read(self):
-        if not self.connected:
-            await self.connect()
+        # Primeira conexão também passa pelo gerenciador (limite de tentativas simultâneas)
+        if not self.connected and not await reconnection_manager.connect(self):
+            raise ConnectionError(f"[{self.name}] Não foi possível conectar")
 
         return await asyncio.wait_for(self.read(), timeout=self.timeout)
 
     async def reconnect_with_backoff(self):
-        delay = 1
-        max_delay = 30
-
-        while self.enabled and not self.connected:
-            try:
-                self.metrics.reconnects_total += 1
-                await self.connect()
-            except Exception as e:
-                logger.exception(
-                    f"[{self.name}] Falha ao reconectar, retry em {delay}s", e)
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, max_delay)
+        """Delega ao gerenciador compartilhado (backoff com jitter e circuit breaker)."""
+        return await reconnection_manager.reconnect(self)
@@ -1,3 +1,6 @@
+import time
+from contextlib import asynccontextmanager
+
 from src.core.logger import get_logger
 import asyncpg
 from src.core.config import settings
@@ -9,40 +12,123 @@ DATABASE_URL = settings['global']['DATABASE_URL']
 if not DATABASE_URL:
     raise ValueError("A variável de ambiente DATABASE_URL deve ser definida.")
 
+_database = settings.get('database', {})
+
+# Configurações de performance por pool ([database.write] / [database.read]):
+# escrita (coletor, inserts em lote) e leitura (API, arquivamento, SPC) são
+# independentes para que consultas pesadas não esgotem as conexões do worker.
+POOL_OPTIONS = {
+    'write': {'min_size': 2, 'max_size': 10, **_database.get('write', {})},
+    'read': {'min_size': 2, 'max_size': 10, **_database.get('read', {})},
+}
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.acquires = 0
+        self.wait_total: float = 0   # segundos aguardando uma conexão livre
+        self.wait_max: float = 0
+        self.last_wait: float = 0
+
+    def record(self, wait: float):
+        self.acquires += 1
+        self.wait_total += wait
+        self.last_wait = wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+class MeteredPool:
+    """Pool do asyncpg que mede o tempo de espera em cada acquire()."""
+
+    def __init__(self, name: str, pool: asyncpg.Pool):
+        self.name = name
+        self.metrics = PoolMetrics()
+        self._pool = pool
+
+    @asynccontextmanager
+    async def acquire(self):
+        start = time.perf_counter()
+        async with self._pool.acquire() as conn:
+            self.metrics.record(time.perf_counter() - start)
+            yield conn
+
+    def snapshot(self) -> dict:
+        m = self.metrics
+        return {
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+            "max_size": self._pool.get_max_size(),
+            "acquires": m.acquires,
+            "wait_avg_ms": (m.wait_total / m.acquires * 1000) if m.acquires else 0,
+            "wait_max_ms": m.wait_max * 1000,
+            "last_wait_ms": m.last_wait * 1000,
+        }
+
+    async def close(self):
+        await self._pool.close()
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
 
-# Variável global para armazenar o pool (Singleton)
-_pool = None
+
+# Pools por papel ('write' / 'read'), criados sob demanda (Singleton por processo)
+_pools: dict[str, MeteredPool] = {}
+
+
+async def _create_pool(role: str) -> MeteredPool:
+    options = dict(POOL_OPTIONS[role])
+    # Leitura pode ser roteada para uma réplica
+    dsn = options.pop('dsn', None) or DATABASE_URL
+
+    try:
+        pool = await asyncpg.create_pool(
+            dsn=dsn,
+            min_size=options.get('min_size'),
+            max_size=options.get('max_size'),
+            # Reinicia a conexão após 1000 usos (evita leak de memória)
+            max_queries=options.get('max_queries', 1000),
+            timeout=options.get('timeout', 30.0),     # Timeout para aquisição de conexão
+            command_timeout=options.get('command_timeout', 60.0)
+        )
+        logger.info(
+            f"Pool de conexões PostgreSQL ({role}) estabelecido [{options.get('min_size')}-{options.get('max_size')}].")
+    except Exception as e:
+        logger.error(f"Falha ao criar o pool de conexões ({role}): {e}")
+        raise
+
+    return MeteredPool(role, pool)
+
+
+async def get_write_pool() -> MeteredPool:
+    """Pool usado pelas gravações do coletor (sempre no banco principal)."""
+    if 'write' not in _pools:
+        _pools['write'] = await _create_pool('write')
+    return _pools['write']
+
+
+async def get_read_pool() -> MeteredPool:
+    """Pool usado pelas consultas (API, SPC, arquivamento); pode apontar para réplica."""
+    if 'read' not in _pools:
+        _pools['read'] = await _create_pool('read')
+    return _pools['read']
 
 
 async def get_pool():
     """
     Cria ou retorna um pool de conexões existente.
+    Mantido por compatibilidade: equivale ao pool de escrita.
     """
-    global _pool
-
-    if _pool is None:
-        try:
-            _pool = await asyncpg.create_pool(
-                dsn=DATABASE_URL,
-                # Configurações de performance:
-                min_size=5,       # Mantém 5 conexões sempre prontas
-                max_size=20,      # Expande até 20 sob carga alta
-                # Reinicia a conexão após 1000 usos (evita leak de memória)
-                max_queries=1000,
-                timeout=30.0,     # Timeout para aquisição de conexão
-                command_timeout=60.0
-            )
-            logger.info("Pool de conexões PostgreSQL estabelecido.")
-        except Exception as e:
-            logger.error(f"Falha ao criar o pool de conexões: {e}")
-            raise
-
-    return _pool
+    return await get_write_pool()
+
+
+def pool_metrics() -> dict[str, dict]:
+    """Tamanho, conexões livres e tempo de espera por acquire de cada pool."""
+    return {role: pool.snapshot() for role, pool in _pools.items()}
 
 
 async def close_pool():
-    """Fecha o pool corretamente ao encerrar a aplicação."""
-    global _pool
-    if _pool:
-        await _pool.close()
-        logger.info("Pool de conexões PostgreSQL encerrado.")
+    """Fecha os pools corretamente ao encerrar a aplicação."""
+    for role, pool in list(_pools.items()):
+        await pool.close()
+        logger.info(f"Pool de conexões PostgreSQL ({role}) encerrado.")
+    _pools.clear()
@@ -1,5 +1,7 @@
+import asyncio
+import orjson
 from datetime import date, datetime
-from src.infrastructure.database.connection import get_pool
+from src.infrastructure.database.connection import get_write_pool, get_read_pool, POOL_OPTIONS
 from src.core.logger import get_logger
 
 from src.core.types.ModbusReadPayload import ModbusReadPayload
@@ -7,14 +9,83 @@ from src.core.types.ModbusReadPayload import ModbusReadPayload
 logger = get_logger(__name__)
 
 
+async def _iter_chunks(pool, query: str, args: list, chunk_size: int):
+    """
+    Percorre o resultado de uma query com cursor no servidor, entregando
+    listas de no máximo `chunk_size` registros (memória limitada).
+    """
+    async with pool.acquire() as conn:
+        # Cursores do asyncpg exigem uma transação aberta
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(query, *args)
+            while True:
+                rows = await cursor.fetch(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+
 class PesagemRepository:
-    _pool = None  # Armazenamos o pool aqui
+    _pool = None  # Armazenamos o pool (escrita) aqui
+    _read_pool = None  # Consultas: pool separado, opcionalmente em réplica
+
+    _STAGING_COLUMNS = ["seq", "maquina_id", "peso",
+                        "classificacao", "operation_id", "timestamp"]
+
+    # ON COMMIT DELETE ROWS: a tabela vive na conexão do pool e é limpa a cada lote
+    # seq: ordem de chegada no lote (não depende do relógio do coletor)
+    _STAGING_QUERY = """
+    CREATE TEMP TABLE IF NOT EXISTS pesagens_staging (
+        seq INTEGER NOT NULL,
+        maquina_id TEXT NOT NULL,
+        peso INTEGER NOT NULL,
+        classificacao INTEGER NOT NULL,
+        operation_id INTEGER,
+        timestamp TIMESTAMP WITH TIME ZONE NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """
+
+    # Serializa gravações concorrentes da mesma máquina até o fim da transação
+    _LOCK_QUERY = "SELECT pg_advisory_xact_lock(hashtext('pesagens:' || m)) FROM unnest($1::text[]) AS m"
+
+    # Uma pesagem é repetida quando seu operation_id é igual ao da anterior da
+    # mesma máquina: a anterior no lote ou, para a primeira, a última gravada
+    # (por id, ordem de inserção). O contador do dispositivo reinicia, então só
+    # a transação imediatamente anterior é comparada.
+    _UPSERT_QUERY = """
+    WITH ultima AS (
+        SELECT m.maquina_id,
+               (SELECT p.operation_id FROM pesagens p
+                WHERE p.maquina_id = m.maquina_id
+                ORDER BY p.id DESC LIMIT 1) AS operation_id
+        FROM (SELECT DISTINCT maquina_id FROM pesagens_staging) m
+    ), lote AS (
+        SELECT s.*, lag(s.operation_id) OVER (PARTITION BY s.maquina_id ORDER BY s.seq) AS anterior
+        FROM pesagens_staging s
+    )
+    INSERT INTO pesagens (maquina_id, peso, classificacao, operation_id, timestamp)
+    SELECT l.maquina_id, l.peso, l.classificacao, l.operation_id, l.timestamp
+    FROM lote l
+    JOIN ultima u ON u.maquina_id = l.maquina_id
+    WHERE l.operation_id IS NULL
+       OR l.operation_id IS DISTINCT FROM coalesce(l.anterior, u.operation_id)
+    ORDER BY l.seq
+    ON CONFLICT (maquina_id, operation_id, timestamp) DO NOTHING
+    """
 
     @classmethod
-    async def initialize(cls):
-        """Inicializa o pool de conexões e as tabelas."""
+    async def initialize(cls, read_only: bool = False):
+        """
+        Inicializa os pools de conexões e as tabelas.
+        read_only=True (API): apenas o pool de leitura, sem DDL.
+        """
+        if cls._read_pool is None:
+            cls._read_pool = await get_read_pool()
+        if read_only:
+            return
+
         if cls._pool is None:
-            cls._pool = await get_pool()
+            cls._pool = await get_write_pool()
 
         query = """
         CREATE TABLE IF NOT EXISTS pesagens (
@@ -22,9 +93,17 @@ class PesagemRepository:
             maquina_id TEXT NOT NULL,
             peso INTEGER NOT NULL,
             classificacao INTEGER NOT NULL DEFAULT 0,
+            operation_id INTEGER,
             timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
         );
+        -- Migração de bancos criados antes da persistência do operation_id
+        ALTER TABLE pesagens ADD COLUMN IF NOT EXISTS operation_id INTEGER;
         CREATE INDEX IF NOT EXISTS idx_pesagens_timestamp ON pesagens (timestamp DESC);
+        -- Última transação gravada por máquina (deduplicação no upsert)
+        CREATE INDEX IF NOT EXISTS idx_pesagens_maquina_id ON pesagens (maquina_id, id DESC);
+        -- Reenvio exato de um lote já gravado (mesmo timestamp) é ignorado
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_pesagens_operation
+            ON pesagens (maquina_id, operation_id, timestamp);
         """
         try:
             async with cls._pool.acquire() as conn:
@@ -35,34 +114,59 @@ class PesagemRepository:
             raise
 
     @classmethod
-    async def insert_many(cls, batch: list[ModbusReadPayload]):
+    async def upsert_many(cls, batch: list[ModbusReadPayload]) -> int:
+        """
+        Grava um lote de forma idempotente e retorna quantas pesagens eram novas.
+
+        O lote é copiado (COPY) para uma tabela temporária e transferido com um
+        único INSERT ... SELECT ... ON CONFLICT DO NOTHING. Uma leitura cujo
+        operation_id repete o da pesagem anterior da máquina (a última transação
+        relida após reconexão ou restart do coletor) é descartada no mesmo
+        comando, sem depender do relógio do coletor. Gravações concorrentes da
+        mesma máquina são serializadas por advisory lock. Erros são propagados
+        para permitir retry.
+        """
         if not batch or cls._pool is None:
-            return
+            return 0
 
-        values = [(item.cw_id, item.weight, item.classification, item.timestamp)
-                  for item in batch]
+        records = [(seq, item.cw_id, item.weight, item.classification, item.operation_id, item.timestamp)
+                   for seq, item in enumerate(batch)]
+        # Ordem fixa evita deadlock entre lotes com as mesmas máquinas
+        maquinas = sorted({item.cw_id for item in batch})
+
+        async with cls._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(cls._LOCK_QUERY, maquinas)
+                await conn.execute(cls._STAGING_QUERY)
+                await conn.copy_records_to_table(
+                    "pesagens_staging", records=records, columns=cls._STAGING_COLUMNS)
+                status = await conn.execute(cls._UPSERT_QUERY)
+
+        # status no formato "INSERT 0 <linhas>"
+        return int(status.split()[-1])
 
-        query = "INSERT INTO pesagens (maquina_id, peso, classificacao, timestamp) VALUES ($1, $2, $3, $4)"
+    @classmethod
+    async def insert_many(cls, batch: list[ModbusReadPayload]):
+        if not batch or cls._pool is None:
+            return
 
         try:
-            async with cls._pool.acquire() as conn:
-                await conn.executemany(query, values)
-                logger.info(
-                    f"Lote de {len(batch)} pesagens armazenado.")
+            inserted = await cls.upsert_many(batch)
+            logger.info(
+                f"Lote de {len(batch)} pesagens armazenado ({len(batch) - inserted} duplicadas ignoradas).")
         except Exception as e:
             logger.error(f"Erro ao inserir lote no banco: {e}")
 
-    @classmethod
-    async def find(cls, maquina_id: str | None = None, data_pesagem: date | None = None, classificacao: int | None = None):
-        """
-        Busca pesagens com filtros opcionais.
-        Exemplo: find(maquina_id=1, data_pesagem=date.today())
-        """
-        if cls._pool is None:
-            return []
+    # Tamanho padrão e máximo das respostas de find/find_json
+    FIND_LIMIT = 1000
+    FIND_MAX_LIMIT = 100_000
 
+    @classmethod
+    def _find_query(cls, maquina_id: str | None, data_pesagem: date | None,
+                    classificacao: int | None, limit: int,
+                    inicio: datetime | None = None, fim: datetime | None = None) -> tuple[str, list]:
         # 1. Base da Query
-        query = "SELECT maquina_id, peso, classificacao, timestamp FROM pesagens WHERE 1=1"
+        query = "SELECT maquina_id, peso, classificacao, operation_id, timestamp FROM pesagens WHERE 1=1"
         args = []
         counter = 1
 
@@ -83,24 +187,210 @@ class PesagemRepository:
             args.append(data_pesagem)
             counter += 1
 
-        query += " ORDER BY timestamp DESC LIMIT 1000"
+        if inicio is not None:
+            query += f" AND timestamp >= ${counter}"
+            args.append(inicio)
+            counter += 1
+
+        if fim is not None:
+            query += f" AND timestamp < ${counter}"
+            args.append(fim)
+            counter += 1
+
+        query += f" ORDER BY timestamp DESC LIMIT ${counter}"
+        args.append(min(limit, cls.FIND_MAX_LIMIT))
+        return query, args
+
+    @classmethod
+    async def find(cls, maquina_id: str | None = None, data_pesagem: date | None = None, classificacao: int | None = None,
+                   limit: int = FIND_LIMIT, inicio: datetime | None = None, fim: datetime | None = None):
+        """
+        Busca pesagens com filtros opcionais.
+        Exemplo: find(maquina_id=1, data_pesagem=date.today())
+        """
+        if cls._read_pool is None:
+            return []
+
+        query, args = cls._find_query(maquina_id, data_pesagem, classificacao, limit, inicio, fim)
 
         try:
-            async with cls._pool.acquire() as conn:
+            async with cls._read_pool.acquire() as conn:
                 rows = await conn.fetch(query, *args)
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Erro ao buscar pesagens: {e}")
             return []
 
+    @classmethod
+    def _find_json_query(cls, maquina_id: str | None = None, data_pesagem: date | None = None,
+                         classificacao: int | None = None, limit: int = FIND_LIMIT, columnar: bool = False,
+                         inicio: datetime | None = None, fim: datetime | None = None) -> tuple[str, list]:
+        query, args = cls._find_query(maquina_id, data_pesagem, classificacao, limit, inicio, fim)
+
+        # A ordem da subquery não é garantida dentro do agregado: cada json_agg
+        # ordena explicitamente. No formato colunar todos usam a mesma numeração
+        # (n), para que empates no timestamp não desalinhem as colunas.
+        if columnar:
+            query = f"""
+            SELECT json_build_object(
+                'maquina_id', coalesce(json_agg(p.maquina_id ORDER BY p.n), '[]'),
+                'peso', coalesce(json_agg(p.peso ORDER BY p.n), '[]'),
+                'classificacao', coalesce(json_agg(p.classificacao ORDER BY p.n), '[]'),
+                'operation_id', coalesce(json_agg(p.operation_id ORDER BY p.n), '[]'),
+                'timestamp', coalesce(json_agg(p.timestamp ORDER BY p.n), '[]')
+            )::text
+            FROM (SELECT q.*, row_number() OVER (ORDER BY q.timestamp DESC) AS n FROM ({query}) q) p
+            """
+        else:
+            query = f"SELECT coalesce(json_agg(p ORDER BY p.timestamp DESC), '[]')::text FROM ({query}) p"
+        return query, args
+
+    @classmethod
+    async def find_json(cls, maquina_id: str | None = None, data_pesagem: date | None = None, classificacao: int | None = None,
+                        limit: int = FIND_LIMIT, columnar: bool = False,
+                        inicio: datetime | None = None, fim: datetime | None = None) -> bytes:
+        """
+        Mesmo resultado de find(), já serializado em JSON pelo PostgreSQL.
+        Evita a conversão Record -> dict -> jsonable_encoder na API.
+
+        columnar=False: [{"maquina_id": ..., "peso": ...}, ...]
+        columnar=True:  {"maquina_id": [...], "peso": [...], ...} (mais compacto)
+        """
+        empty = b'{}' if columnar else b'[]'
+        if cls._read_pool is None:
+            return empty
+
+        query, args = cls._find_json_query(maquina_id, data_pesagem, classificacao, limit, columnar, inicio, fim)
+
+        try:
+            async with cls._read_pool.acquire() as conn:
+                result = await conn.fetchval(query, *args)
+                return result.encode()
+        except Exception as e:
+            logger.error(f"Erro ao buscar pesagens: {e}")
+            return empty
+
+    # Lotes (find_many_json): consultas simultâneas, abaixo do tamanho do pool de
+    # leitura para que lotes não esgotem as conexões da API, e linhas por lote
+    BATCH_CONCURRENCY = max(1, POOL_OPTIONS['read']['max_size'] // 2)
+    BATCH_MAX_ROWS = FIND_MAX_LIMIT
+    _batch_semaphore: asyncio.Semaphore | None = None
+
+    @classmethod
+    async def find_many_json(cls, queries: dict[str, dict], columnar: bool = False) -> bytes:
+        """
+        Executa várias consultas find_json em paralelo no pool de leitura (no
+        máximo BATCH_CONCURRENCY ao mesmo tempo, somando todos os lotes) e monta
+        {"<chave>": <resultado>, ...} sem decodificar o JSON retornado pelo banco.
+        Uma consulta que falha vira {"erro": "..."} na sua chave, sem afetar as demais.
+        queries: {"<chave>": {"maquina_id": ..., "inicio": ..., "fim": ..., "limit": ..., ...}}
+        Lança ValueError se a soma dos limites passar de BATCH_MAX_ROWS.
+        """
+        total = sum(min(filters.get('limit', cls.FIND_LIMIT), cls.FIND_MAX_LIMIT) for filters in queries.values())
+        if total > cls.BATCH_MAX_ROWS:
+            raise ValueError(f"O lote pode retornar {total} pesagens; o máximo é {cls.BATCH_MAX_ROWS}")
+
+        if cls._batch_semaphore is None:
+            cls._batch_semaphore = asyncio.Semaphore(cls.BATCH_CONCURRENCY)
+
+        async def run(key: str) -> bytes:
+            async with cls._batch_semaphore:
+                try:
+                    if cls._read_pool is None:
+                        raise RuntimeError("Pool de leitura não inicializado")
+                    query, args = cls._find_json_query(columnar=columnar, **queries[key])
+                    async with cls._read_pool.acquire() as conn:
+                        return (await conn.fetchval(query, *args)).encode()
+                except Exception as e:
+                    logger.error(f"Erro na consulta '{key}' do lote de pesagens: {e}")
+                    return orjson.dumps({"erro": str(e)})
+
+        keys = list(queries)
+        results = await asyncio.gather(*(run(key) for key in keys))
+
+        parts = [orjson.dumps(key) + b':' + result for key, result in zip(keys, results)]
+        return b'{' + b','.join(parts) + b'}'
+
+    @classmethod
+    async def first_timestamp(cls) -> datetime | None:
+        """Instante da pesagem mais antiga ainda presente na tabela."""
+        if cls._read_pool is None:
+            return None
+
+        async with cls._read_pool.acquire() as conn:
+            return await conn.fetchval("SELECT min(timestamp) FROM pesagens")
+
+    @classmethod
+    async def fetch_after(cls, last_id: int, limit: int = 50_000):
+        """
+        Pesagens com id maior que `last_id`, em ordem de inserção.
+        Permite leitura incremental (ex: janelas do SPC) sem reler a tabela.
+        """
+        if cls._read_pool is None:
+            return []
+
+        query = """
+        SELECT id, maquina_id, peso, classificacao
+        FROM pesagens
+        WHERE id > $1
+        ORDER BY id
+        LIMIT $2
+        """
+        async with cls._read_pool.acquire() as conn:
+            return await conn.fetch(query, last_id, limit)
+
+    @classmethod
+    async def last_id(cls) -> int:
+        """Maior id já gravado em pesagens (0 se a tabela estiver vazia)."""
+        if cls._read_pool is None:
+            return 0
+
+        async with cls._read_pool.acquire() as conn:
+            return await conn.fetchval("SELECT coalesce(max(id), 0) FROM pesagens")
+
+    @classmethod
+    async def count_range(cls, inicio: datetime, fim: datetime) -> int:
+        """Quantidade de pesagens com timestamp em [inicio, fim)."""
+        if cls._read_pool is None:
+            return 0
+
+        async with cls._read_pool.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT count(*) FROM pesagens WHERE timestamp >= $1 AND timestamp < $2", inicio, fim)
+
+    @classmethod
+    async def iter_range(cls, inicio: datetime, fim: datetime, chunk_size: int = 50_000):
+        """
+        Itera, em blocos, todas as pesagens com timestamp em [inicio, fim)
+        (usado no arquivamento). Os limites são instantes com fuso, então o
+        dia não depende do TimeZone da sessão do banco.
+        """
+        if cls._read_pool is None:
+            return
+
+        query = """
+        SELECT maquina_id, peso, classificacao, operation_id, timestamp
+        FROM pesagens
+        WHERE timestamp >= $1 AND timestamp < $2
+        ORDER BY timestamp
+        """
+        async for rows in _iter_chunks(cls._read_pool, query, [inicio, fim], chunk_size):
+            yield rows
+
 
 class EventRepository:
     _pool = None
+    _read_pool = None
 
     @classmethod
-    async def initialize(cls):
+    async def initialize(cls, read_only: bool = False):
+        if cls._read_pool is None:
+            cls._read_pool = await get_read_pool()
+        if read_only:
+            return
+
         if cls._pool is None:
-            cls._pool = await get_pool()
+            cls._pool = await get_write_pool()
 
         query = """
         CREATE TABLE IF NOT EXISTS events (
@@ -144,7 +434,7 @@ class EventRepository:
         Busca eventos com filtros opcionais.
         Exemplo: find(maquina_id=1, operation_type=1, data_evento=date.today())
         """
-        if cls._pool is None:
+        if cls._read_pool is None:
             return []
 
         # 1. Base da Query
@@ -177,9 +467,180 @@ class EventRepository:
         query += " ORDER BY timestamp DESC LIMIT 1000"
 
         try:
-            async with cls._pool.acquire() as conn:
+            async with cls._read_pool.acquire() as conn:
                 rows = await conn.fetch(query, *args)
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Erro ao buscar eventos: {e}")
             return []
+
+    @classmethod
+    async def first_timestamp(cls) -> datetime | None:
+        """Instante do evento mais antigo ainda presente na tabela."""
+        if cls._read_pool is None:
+            return None
+
+        async with cls._read_pool.acquire() as conn:
+            return await conn.fetchval("SELECT min(timestamp) FROM events")
+
+    @classmethod
+    async def count_range(cls, inicio: datetime, fim: datetime) -> int:
+        """Quantidade de eventos com timestamp em [inicio, fim)."""
+        if cls._read_pool is None:
+            return 0
+
+        async with cls._read_pool.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT count(*) FROM events WHERE timestamp >= $1 AND timestamp < $2", inicio, fim)
+
+    @classmethod
+    async def iter_range(cls, inicio: datetime, fim: datetime, chunk_size: int = 50_000):
+        """
+        Itera, em blocos, todos os eventos com timestamp em [inicio, fim)
+        (usado no arquivamento). Os limites são instantes com fuso, então o
+        dia não depende do TimeZone da sessão do banco.
+        """
+        if cls._read_pool is None:
+            return
+
+        query = """
+        SELECT maquina_id, evento, reason, timestamp
+        FROM events
+        WHERE timestamp >= $1 AND timestamp < $2
+        ORDER BY timestamp
+        """
+        async for rows in _iter_chunks(cls._read_pool, query, [inicio, fim], chunk_size):
+            yield rows
+
+
+class DowntimeRepository:
+    """
+    Intervalos de parada por máquina, mantidos incrementalmente pelo coletor
+    a cada troca de estado (produzindo <-> parado). Um intervalo aberto tem
+    ended_at NULL; o índice parcial garante no máximo um aberto por máquina.
+    """
+    _pool = None
+    _read_pool = None
+
+    @classmethod
+    async def initialize(cls, read_only: bool = False):
+        if cls._read_pool is None:
+            cls._read_pool = await get_read_pool()
+        if read_only:
+            return
+
+        if cls._pool is None:
+            cls._pool = await get_write_pool()
+
+        query = """
+        CREATE TABLE IF NOT EXISTS downtime_intervals (
+            id SERIAL PRIMARY KEY,
+            maquina_id TEXT NOT NULL,
+            reason INTEGER NOT NULL,
+            started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            ended_at TIMESTAMP WITH TIME ZONE
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_downtime_open
+            ON downtime_intervals (maquina_id) WHERE ended_at IS NULL;
+        CREATE INDEX IF NOT EXISTS idx_downtime_started
+            ON downtime_intervals (maquina_id, started_at DESC);
+        """
+        try:
+            async with cls._pool.acquire() as conn:
+                await conn.execute(query)
+            logger.debug("Tabela de paradas inicializada via Async.")
+        except Exception as e:
+            logger.error(f"Erro ao inicializar banco: {e}")
+            raise
+
+    @classmethod
+    async def open(cls, item: ModbusReadPayload):
+        """Abre um intervalo de parada (ignorado se a máquina já tem um aberto)."""
+        if cls._pool is None:
+            return
+
+        query = """
+        INSERT INTO downtime_intervals (maquina_id, reason, started_at)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (maquina_id) WHERE ended_at IS NULL DO NOTHING
+        """
+        async with cls._pool.acquire() as conn:
+            await conn.execute(query, item.cw_id, item.reason, item.timestamp)
+
+    @classmethod
+    async def close(cls, item: ModbusReadPayload):
+        """Fecha o intervalo aberto da máquina (se houver)."""
+        if cls._pool is None:
+            return
+
+        query = """
+        UPDATE downtime_intervals SET ended_at = $2
+        WHERE maquina_id = $1 AND ended_at IS NULL
+        """
+        async with cls._pool.acquire() as conn:
+            await conn.execute(query, item.cw_id, item.timestamp)
+
+    # Sobreposição de cada intervalo com [inicio, fim); intervalos abertos vão até agora
+    _OVERLAP = """
+    SELECT maquina_id, reason,
+           least(coalesce(ended_at, now()), $2) - greatest(started_at, $1) AS duracao
+    FROM downtime_intervals
+    WHERE started_at < $2 AND coalesce(ended_at, now()) > $1
+      AND ($3::text IS NULL OR maquina_id = $3)
+    """
+
+    @classmethod
+    async def availability(cls, inicio: datetime, fim: datetime, maquina_id: str | None = None):
+        """
+        Disponibilidade por máquina no intervalo: 1 - tempo parado / tempo decorrido
+        (o período é limitado a agora quando `fim` está no futuro).
+        """
+        if cls._read_pool is None:
+            return []
+
+        query = f"""
+        SELECT maquina_id,
+               count(*) AS paradas,
+               extract(epoch FROM sum(duracao))::float AS parado_segundos,
+               extract(epoch FROM least($2, now()) - $1)::float AS periodo_segundos
+        FROM ({cls._OVERLAP}) o
+        GROUP BY maquina_id
+        ORDER BY maquina_id
+        """
+        try:
+            async with cls._read_pool.acquire() as conn:
+                rows = await conn.fetch(query, inicio, fim, maquina_id)
+        except Exception as e:
+            logger.error(f"Erro ao calcular disponibilidade: {e}")
+            return []
+
+        result = []
+        for row in rows:
+            periodo = row['periodo_segundos']
+            result.append({
+                **dict(row),
+                "disponibilidade": 1 - row['parado_segundos'] / periodo if periodo > 0 else None,
+            })
+        return result
+
+    @classmethod
+    async def by_reason(cls, inicio: datetime, fim: datetime, maquina_id: str | None = None):
+        """Tempo parado e número de paradas por máquina e motivo no intervalo."""
+        if cls._read_pool is None:
+            return []
+
+        query = f"""
+        SELECT maquina_id, reason,
+               count(*) AS paradas,
+               extract(epoch FROM sum(duracao))::float AS parado_segundos
+        FROM ({cls._OVERLAP}) o
+        GROUP BY maquina_id, reason
+        ORDER BY maquina_id, parado_segundos DESC
+        """
+        try:
+            async with cls._read_pool.acquire() as conn:
+                rows = await conn.fetch(query, inicio, fim, maquina_id)
+                return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Erro ao buscar paradas por motivo: {e}")
+            return []
@@ -0,0 +1,142 @@
+import asyncio
+import random
+import time
+from enum import Enum
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'        # operando normalmente
+    OPEN = 'open'            # muitas falhas seguidas: tentativas suspensas
+    HALF_OPEN = 'half_open'  # período de espera acabou: uma tentativa de teste
+
+
+class _DeviceState:
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0            # falhas consecutivas
+        self.opened_at = 0.0
+        self.connects_total = 0
+        self.failures_total = 0
+
+
+class ReconnectionManager:
+    """
+    Gerencia reconexões de todos os dispositivos:
+
+    - backoff exponencial com jitter total (espera aleatória entre 0 e o teto),
+      evitando que dezenas de dispositivos tentem no mesmo instante;
+    - circuit breaker por dispositivo: após `failure_threshold` falhas seguidas
+      as tentativas ficam suspensas por `open_timeout` segundos;
+    - limite global de tentativas de conexão simultâneas (`max_concurrent`).
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 30.0, max_concurrent: int = 4,
+                 failure_threshold: int = 5, open_timeout: float = 60.0) -> None:
+        self.configure(base_delay=base_delay, max_delay=max_delay, max_concurrent=max_concurrent,
+                       failure_threshold=failure_threshold, open_timeout=open_timeout)
+        self._devices: dict[str, _DeviceState] = {}
+
+    def configure(self, base_delay: float | None = None, max_delay: float | None = None,
+                  max_concurrent: int | None = None, failure_threshold: int | None = None,
+                  open_timeout: float | None = None) -> None:
+        """Ajusta os parâmetros (ex: a partir da seção [reconnect] do settings.toml)."""
+        if base_delay is not None:
+            self.base_delay = base_delay
+        if max_delay is not None:
+            self.max_delay = max_delay
+        if failure_threshold is not None:
+            self.failure_threshold = failure_threshold
+        if open_timeout is not None:
+            self.open_timeout = open_timeout
+        if max_concurrent is not None:
+            self.max_concurrent = max_concurrent
+            self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def _device(self, name: str) -> _DeviceState:
+        return self._devices.setdefault(name, _DeviceState())
+
+    def _delay(self, device: _DeviceState) -> float:
+        if device.state is CircuitState.OPEN:
+            remaining = device.opened_at + self.open_timeout - time.monotonic()
+            # Jitter também na reabertura para não sincronizar os dispositivos
+            return max(remaining, 0) + random.uniform(0, self.base_delay)
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** min(device.failures, 16))
+        return random.uniform(0, ceiling)
+
+    def _failure(self, name: str, device: _DeviceState) -> None:
+        device.failures += 1
+        device.failures_total += 1
+
+        if device.state is CircuitState.HALF_OPEN or device.failures >= self.failure_threshold:
+            if device.state is CircuitState.CLOSED:
+                logger.warning(
+                    f"[{name}] Circuito aberto após {device.failures} falhas, nova tentativa em {self.open_timeout}s")
+            device.state = CircuitState.OPEN
+            device.opened_at = time.monotonic()
+
+    def _success(self, name: str, device: _DeviceState) -> None:
+        if device.state is not CircuitState.CLOSED:
+            logger.info(f"[{name}] Circuito fechado")
+        device.state = CircuitState.CLOSED
+        device.failures = 0
+        device.connects_total += 1
+
+    async def connect(self, cw) -> bool:
+        """
+        Uma tentativa de conexão de `cw`, sem espera prévia (ex: a primeira,
+        no início do listener). Também respeita o limite de tentativas
+        simultâneas e conta para o circuit breaker.
+        """
+        device = self._device(cw.name)
+
+        async with self._semaphore:
+            try:
+                connected = await cw.connect()
+            except Exception as e:
+                logger.error(f"[{cw.name}] Falha ao conectar: {e}")
+                connected = False
+
+        if connected:
+            self._success(cw.name, device)
+        else:
+            self._failure(cw.name, device)
+        return connected
+
+    async def reconnect(self, cw) -> bool:
+        """
+        Tenta reconectar `cw` até conseguir ou o dispositivo ser desabilitado.
+        Sempre aguarda entre tentativas, inclusive quando connect() apenas
+        retorna False sem lançar exceção.
+        """
+        device = self._device(cw.name)
+
+        while cw.enabled and not cw.connected:
+            await asyncio.sleep(self._delay(device))
+
+            if device.state is CircuitState.OPEN:
+                device.state = CircuitState.HALF_OPEN
+
+            cw.metrics.reconnects_total += 1
+            if await self.connect(cw):
+                return True
+
+        return False
+
+    def state(self, name: str) -> CircuitState:
+        return self._device(name).state
+
+    def metrics(self) -> dict[str, dict]:
+        return {name: {"state": device.state.value,
+                       "consecutive_failures": device.failures,
+                       "failures_total": device.failures_total,
+                       "connects_total": device.connects_total}
+                for name, device in self._devices.items()}
+
+
+# Instância compartilhada por todos os CheckWeighers do processo
+reconnection_manager = ReconnectionManager()
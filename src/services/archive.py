@@ -0,0 +1,237 @@
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.config.settings import ARCHIVE_PATH
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.infrastructure.database.repositories import PesagemRepository, EventRepository
+
+logger = get_logger(__name__)
+
+_config = settings.get('archive', {})
+
+# Intervalo entre execuções do job de arquivamento (segundos)
+ARCHIVE_INTERVAL = _config.get('interval', 3600)
+# Registros por bloco lido do banco / row group gravado no parquet
+CHUNK_SIZE = _config.get('chunk_size', 50_000)
+COMPRESSION = _config.get('compression', 'zstd')
+# Limite de linhas devolvidas por consulta histórica
+QUERY_LIMIT = _config.get('query_limit', 100_000)
+# Fuso que define o dia de cada arquivo (ex: "America/Sao_Paulo"); padrão: fuso local da máquina
+TIMEZONE = ZoneInfo(_config['timezone']) if _config.get('timezone') else None
+# Espera após a meia-noite (segundos) antes de considerar o dia fechado
+GRACE = _config.get('grace', 3600)
+# Dias fechados mais recentes reconferidos com o banco a cada execução
+RECHECK_DAYS = _config.get('recheck_days', 7)
+
+_TIMESTAMP = pa.timestamp('us', tz='UTC')
+
+# Cada tabela arquivada: repositório de origem + schema colunar
+TABLES = {
+    'pesagens': (PesagemRepository, pa.schema([
+        ('maquina_id', pa.string()),
+        ('peso', pa.int32()),
+        ('classificacao', pa.int32()),
+        ('operation_id', pa.int32()),
+        ('timestamp', _TIMESTAMP),
+    ])),
+    'events': (EventRepository, pa.schema([
+        ('maquina_id', pa.string()),
+        ('evento', pa.int32()),
+        ('reason', pa.int32()),
+        ('timestamp', _TIMESTAMP),
+    ])),
+}
+
+
+def day_path(table: str, dia: date):
+    """Arquivo de um dia: archive/<tabela>/<AAAA-MM>/<AAAA-MM-DD>.parquet"""
+    return ARCHIVE_PATH / table / f"{dia:%Y-%m}" / f"{dia:%Y-%m-%d}.parquet"
+
+
+def day_bounds(dia: date) -> tuple[datetime, datetime]:
+    """
+    Início e fim (exclusivo) do dia no fuso do arquivo, como instantes com fuso.
+    As consultas usam estes limites, e não `::date`, para que o dia não dependa
+    do TimeZone da sessão do banco.
+    """
+    start = datetime.combine(dia, time(), tzinfo=TIMEZONE)
+    end = datetime.combine(dia + timedelta(days=1), time(), tzinfo=TIMEZONE)
+    if TIMEZONE is None:
+        # Meia-noite local da máquina, com o deslocamento válido naquele dia
+        start, end = start.astimezone(), end.astimezone()
+    return start, end
+
+
+def local_date(instant: datetime) -> date:
+    """Dia de um instante no fuso do arquivo."""
+    return instant.astimezone(TIMEZONE).date()
+
+
+def closed_until() -> date:
+    """Primeiro dia ainda não fechado: os anteriores terminaram há mais de GRACE segundos."""
+    return local_date(datetime.now(timezone.utc) - timedelta(seconds=GRACE))
+
+
+def _to_batch(rows, schema: pa.Schema) -> pa.RecordBatch:
+    # Converte registros do asyncpg coluna a coluna (sem dicts intermediários)
+    columns = [pa.array([row[i] for row in rows], type=field.type)
+               for i, field in enumerate(schema)]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def _write_rows(writer: pq.ParquetWriter, rows, schema: pa.Schema) -> None:
+    writer.write_batch(_to_batch(rows, schema))
+
+
+async def export_day(table: str, dia: date) -> int:
+    """
+    Exporta um dia fechado de `table` para parquet, em blocos de CHUNK_SIZE.
+    O arquivo é escrito em .tmp e renomeado ao final, então um arquivo
+    existente está sempre completo. Retorna o número de linhas exportadas.
+    """
+    repository, schema = TABLES[table]
+    target = day_path(table, dia)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix('.tmp')
+
+    total = 0
+    writer = pq.ParquetWriter(tmp, schema, compression=COMPRESSION)
+    try:
+        async for rows in repository.iter_range(*day_bounds(dia), chunk_size=CHUNK_SIZE):
+            # Conversão e escrita são bloqueantes (listas Python por coluna a
+            # cada bloco): saem juntas do event loop, que faz o polling Modbus
+            await asyncio.to_thread(_write_rows, writer, rows, schema)
+            total += len(rows)
+    except BaseException:
+        writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+
+    writer.close()
+    tmp.replace(target)
+    logger.info(f"Arquivo {target.name} de {table} gerado com {total} linhas.")
+    return total
+
+
+async def pending_days(table: str) -> list[date]:
+    """
+    Dias fechados a exportar: os que ainda não têm arquivo e, entre os
+    RECHECK_DAYS mais recentes, os que receberam linhas depois de exportados
+    (contagem no banco diferente da gravada no arquivo).
+    """
+    repository, _ = TABLES[table]
+    first = await repository.first_timestamp()
+    if first is None:
+        return []
+
+    days = []
+    dia = local_date(first)
+    end = closed_until()
+    while dia < end:
+        path = day_path(table, dia)
+        if not path.exists():
+            days.append(dia)
+        elif (end - dia).days <= RECHECK_DAYS:
+            metadata = await asyncio.to_thread(pq.read_metadata, path)
+            total = await repository.count_range(*day_bounds(dia))
+            if total != metadata.num_rows:
+                logger.info(
+                    f"{table} de {dia} mudou após o arquivamento ({metadata.num_rows} -> {total} linhas): reexportando.")
+                days.append(dia)
+        dia += timedelta(days=1)
+    return days
+
+
+async def export_pending() -> int:
+    """Exporta todos os dias pendentes de todas as tabelas."""
+    total = 0
+    for table in TABLES:
+        for dia in await pending_days(table):
+            total += await export_day(table, dia)
+    return total
+
+
+async def archive_worker():
+    logger.info("Worker de arquivamento iniciado.")
+
+    while True:
+        try:
+            await export_pending()
+        except asyncio.CancelledError:
+            logger.info("Worker de arquivamento sendo encerrado...")
+            break
+        except Exception as e:
+            logger.error(f"Erro no arquivamento: {e}")
+
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+
+def query_archive(table: str, inicio: date, fim: date, limit: int = QUERY_LIMIT, **filters) -> list[dict]:
+    """
+    Consulta o histórico arquivado entre `inicio` e `fim` (inclusive).
+    Apenas os arquivos dos dias do intervalo são abertos e os filtros
+    (ex: maquina_id=..., classificacao=...) são aplicados na leitura.
+    Função bloqueante: na API use `asyncio.to_thread`.
+    """
+    _, schema = TABLES[table]
+
+    files = []
+    dia = inicio
+    while dia <= fim:
+        path = day_path(table, dia)
+        if path.exists():
+            files.append(str(path))
+        dia += timedelta(days=1)
+
+    if not files:
+        return []
+
+    expression = None
+    for column, value in filters.items():
+        if value is None:
+            continue
+        condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+
+    dataset = ds.dataset(files, schema=schema, format='parquet')
+    result = dataset.head(limit, filter=expression) if limit else dataset.to_table(filter=expression)
+    return result.to_pylist()
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    from src.infrastructure.database.connection import close_pool
+
+    parser = argparse.ArgumentParser(description="Arquivo histórico em parquet")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('export', help="Exporta os dias fechados pendentes")
+    query = sub.add_parser('query', help="Consulta o arquivo histórico")
+    query.add_argument('table', choices=list(TABLES))
+    query.add_argument('inicio', type=date.fromisoformat)
+    query.add_argument('fim', type=date.fromisoformat)
+    query.add_argument('--maquina_id')
+    query.add_argument('--limit', type=int, default=QUERY_LIMIT)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        async def run():
+            await PesagemRepository.initialize()
+            await EventRepository.initialize()
+            try:
+                print(f"{await export_pending()} linhas exportadas")
+            finally:
+                await close_pool()
+
+        asyncio.run(run())
+    else:
+        rows = query_archive(args.table, args.inicio, args.fim,
+                             limit=args.limit, maquina_id=args.maquina_id)
+        for row in rows:
+            print(json.dumps(row, default=datetime.isoformat))
@@ -0,0 +1,46 @@
+from src.core.logger import get_logger
+from src.core.types.ModbusReadPayload import ModbusReadPayload
+from src.infrastructure.database.repositories import DowntimeRepository, EventRepository
+
+logger = get_logger(__name__)
+
+# operation_type lido do dispositivo
+PRODUZINDO = 1
+PARADO = 2
+
+# Máquinas que já pesaram desde o início do coletor
+_running: set[str] = set()
+
+
+async def track_downtime(payload: ModbusReadPayload):
+    """
+    Callback do evento OPERATION_TYPE_CHANGED: grava o evento e abre/fecha o
+    intervalo de parada da máquina. Erros são apenas registrados para não
+    interromper o listener (que trataria a exceção como falha de leitura).
+    """
+    try:
+        await EventRepository.insert_many([payload])
+
+        if payload.operation_type == PARADO:
+            await DowntimeRepository.open(payload)
+        elif payload.operation_type == PRODUZINDO:
+            await DowntimeRepository.close(payload)
+    except Exception as e:
+        logger.error(f"[{payload.cw_id}] Erro ao registrar troca de estado: {e}")
+
+
+async def close_stale_downtime(payload: ModbusReadPayload):
+    """
+    Callback do evento WEIGHT_READ: na primeira pesagem de cada máquina após o
+    início do coletor, fecha a parada deixada aberta pela execução anterior.
+    Sem leitura anterior não há OPERATION_TYPE_CHANGED, e nada é gravado em
+    events: a troca de estado não foi observada.
+    """
+    if payload.cw_id in _running:
+        return
+
+    try:
+        await DowntimeRepository.close(payload)
+        _running.add(payload.cw_id)
+    except Exception as e:
+        logger.error(f"[{payload.cw_id}] Erro ao fechar parada anterior ao início: {e}")
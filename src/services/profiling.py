@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+import uuid
+
+from src.config.settings import PROFILE_PATH
+from src.core.logger import get_logger
+from src.utils.profiler import profile_for
+
+logger = get_logger(__name__)
+
+# O coletor não tem servidor HTTP: a API deixa um pedido `<id>.request` em
+# PROFILE_PATH, o coletor executa o profiling e grava `<id>.folded` ao lado.
+# Um arquivo por pedido: pedidos simultâneos entram na fila, sem se sobrescrever.
+POLL_INTERVAL = 1.0
+# Tempo máximo aguardando o coletor começar o pedido (fila de outros profilings)
+QUEUE_TIMEOUT = 150
+
+
+def _pending_requests() -> list:
+    """Pedidos aguardando atendimento, do mais antigo ao mais novo."""
+    requests = []
+    for path in PROFILE_PATH.glob("*.request"):
+        try:
+            requests.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue  # cancelado pelo solicitante
+    return [path for _, path in sorted(requests)]
+
+
+async def profile_collector(duration: float, interval: float = 0.005) -> str:
+    """
+    Pede um profiling ao processo coletor e aguarda o resultado.
+    Lança TimeoutError se o coletor não responder (não iniciado ou ocupado).
+    """
+    PROFILE_PATH.mkdir(parents=True, exist_ok=True)
+    request_id = uuid.uuid4().hex
+    request = PROFILE_PATH / f"{request_id}.request"
+    result = PROFILE_PATH / f"{request_id}.folded"
+
+    tmp = PROFILE_PATH / f"{request_id}.request.tmp"
+    tmp.write_text(json.dumps({"id": request_id, "duration": duration, "interval": interval}))
+    tmp.replace(request)
+
+    # Enquanto o pedido está na fila, o prazo é QUEUE_TIMEOUT; ao ser
+    # atendido (arquivo removido pelo coletor), passa a contar a duração
+    deadline = time.monotonic() + QUEUE_TIMEOUT
+    started = False
+    try:
+        while time.monotonic() < deadline:
+            if result.exists():
+                return result.read_text(encoding="utf-8")
+            if not started and not request.exists():
+                started = True
+                deadline = time.monotonic() + duration + POLL_INTERVAL * 2 + 5
+            await asyncio.sleep(0.2)
+        raise TimeoutError("O coletor não respondeu ao pedido de profiling")
+    finally:
+        # Remove o próprio pedido se ainda não foi atendido
+        request.unlink(missing_ok=True)
+        result.unlink(missing_ok=True)
+
+
+async def profile_watcher():
+    """Task do coletor: atende pedidos de profiling feitos pela API."""
+    logger.info("Monitor de profiling iniciado.")
+
+    while True:
+        try:
+            for path in _pending_requests():
+                try:
+                    content = path.read_text()
+                    path.unlink()
+                except FileNotFoundError:
+                    continue  # cancelado pelo solicitante
+
+                request = json.loads(content)
+
+                logger.info(f"Profiling do coletor por {request['duration']}s...")
+                stacks = await asyncio.to_thread(profile_for, request['duration'], request['interval'])
+
+                result = PROFILE_PATH / f"{request['id']}.folded"
+                tmp = result.with_suffix('.tmp')
+                tmp.write_text(stacks, encoding="utf-8")
+                tmp.replace(result)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Erro no profiling do coletor: {e}")
+
+        await asyncio.sleep(POLL_INTERVAL)
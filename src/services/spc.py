@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.core.spc import RollingWindow, process_stats
+from src.infrastructure.database.repositories import PesagemRepository
+
+logger = get_logger(__name__)
+
+_config = settings.get('spc', {})
+
+WINDOW_SIZE = _config.get('window', 5_000)
+BINS = _config.get('bins', 20)
+# Limites de especificação padrão e por máquina ([spc.limits."<cw_id>"])
+DEFAULT_LSL = _config.get('lsl')
+DEFAULT_USL = _config.get('usl')
+LIMITS = _config.get('limits', {})
+# Máximo de linhas lidas do banco por sincronização
+FETCH_SIZE = 50_000
+
+
+class SPCMonitor:
+    """
+    Mantém uma RollingWindow por máquina alimentada incrementalmente pela
+    tabela pesagens (apenas ids novos a cada sincronização).
+    """
+    _windows: dict[str, RollingWindow] = {}
+    _last_id: int | None = None
+    _lock = asyncio.Lock()
+
+    @classmethod
+    async def sync(cls):
+        """Carrega as pesagens gravadas desde a última sincronização."""
+        async with cls._lock:
+            # Lê no máximo o suficiente para encher as janelas: na primeira carga
+            # e após um longo período sem consultas, as pesagens mais antigas
+            # seriam descartadas pela janela de qualquer forma
+            machines = max(len(settings.cws), 1)
+            floor = max(await PesagemRepository.last_id() - WINDOW_SIZE * machines, 0)
+            cls._last_id = max(cls._last_id or 0, floor)
+
+            while True:
+                rows = await PesagemRepository.fetch_after(cls._last_id, FETCH_SIZE)
+                if not rows:
+                    break
+
+                cls._append(rows)
+                cls._last_id = rows[-1]['id']
+
+                if len(rows) < FETCH_SIZE:
+                    break
+
+    @classmethod
+    def _append(cls, rows):
+        machine = np.array([row['maquina_id'] for row in rows])
+        weights = np.fromiter((row['peso'] for row in rows), dtype=np.float64, count=len(rows))
+        classes = np.fromiter((row['classificacao'] for row in rows), dtype=np.int32, count=len(rows))
+
+        # Agrupa o lote por máquina e insere cada grupo de uma vez
+        for cw_id in np.unique(machine):
+            mask = machine == cw_id
+            window = cls._windows.setdefault(str(cw_id), RollingWindow(WINDOW_SIZE))
+            window.extend(weights[mask], classes[mask])
+
+    @classmethod
+    def stats(cls, maquina_id: str, lsl: float | None = None, usl: float | None = None, bins: int = BINS) -> dict:
+        window = cls._windows.get(maquina_id)
+        if window is None:
+            return {"maquina_id": maquina_id, "n": 0}
+
+        limits = LIMITS.get(maquina_id, {})
+        lsl = lsl if lsl is not None else limits.get('lsl', DEFAULT_LSL)
+        usl = usl if usl is not None else limits.get('usl', DEFAULT_USL)
+
+        weights, classes = window.values()
+        return {"maquina_id": maquina_id, "lsl": lsl, "usl": usl,
+                **process_stats(weights, classes, lsl=lsl, usl=usl, bins=bins)}
+
+    @classmethod
+    def machines(cls) -> list[str]:
+        return sorted(cls._windows)
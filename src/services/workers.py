@@ -1,10 +1,95 @@
 import asyncio
+
+import asyncpg
+
 from src.core.buffer import Buffer
+from src.core.config import settings
+from src.infrastructure.database.connection import pool_metrics
+from src.infrastructure.reconnection import reconnection_manager
 from src.infrastructure.database.repositories import PesagemRepository
 from src.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Intervalo (segundos) entre logs do buffer e das conexões por dispositivo e dos pools
+METRICS_INTERVAL = 60
+
+# Espera (segundos) antes de repetir um lote que falhou; dobra a cada falha
+RETRY_DELAY = 1
+RETRY_MAX_DELAY = 30
+
+# Erros causados pelo próprio dado (conversão no COPY ou restrição no banco):
+# repetir o lote não resolve
+INVALID_DATA_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError,
+                       TypeError, ValueError, OverflowError)
+
+
+def log_metrics(buffer: Buffer):
+    for cw_id, m in buffer.metrics().items():
+        logger.info(
+            f"Buffer [{cw_id}] profundidade={m['depth']}/{m['maxsize']} ({m['policy']}) "
+            f"disco={m['spilled']} descartados={m['dropped_total']} bloqueios={m['blocked_total']}")
+
+    circuits = reconnection_manager.metrics()
+    for cw in settings.cws:
+        if not cw.enabled:
+            continue
+        circuit = circuits.get(cw.name, {})
+        logger.info(
+            f"Dispositivo [{cw.name}] conectado={cw.connected} "
+            f"tempo desconectado={cw.metrics.disconnected_seconds:.0f}s reconexões={cw.metrics.reconnects_total} "
+            f"circuito={circuit.get('state', 'closed')} falhas={circuit.get('failures_total', 0)}")
+
+    for role, m in pool_metrics().items():
+        logger.info(
+            f"Pool [{role}] conexões={m['size']}/{m['max_size']} livres={m['idle']} "
+            f"espera média={m['wait_avg_ms']:.1f}ms máx={m['wait_max_ms']:.1f}ms")
+
+
+async def store_batch(batch: list):
+    """
+    Grava o lote, repetindo até conseguir. upsert_many é idempotente, então
+    repetir um lote que chegou a ser gravado antes da falha é seguro; enquanto
+    isso, o Buffer segue aplicando sua política de estouro aos novos itens.
+    """
+    delay = RETRY_DELAY
+    attempt = 1
+
+    while True:
+        try:
+            inserted = await PesagemRepository.upsert_many(batch)
+            logger.info(
+                f"Lote de {len(batch)} pesagens armazenado ({len(batch) - inserted} duplicadas ignoradas).")
+            return
+        except INVALID_DATA_ERRORS as e:
+            # Isola o item inválido para não perder o restante do lote
+            if len(batch) == 1:
+                logger.error(f"Pesagem descartada por dado inválido ({batch[0]}): {e}")
+                return
+            logger.error(f"Lote com dado inválido, gravando item a item: {e}")
+            for item in batch:
+                await store_batch([item])
+            return
+        except Exception as e:
+            logger.error(
+                f"Erro ao gravar lote de {len(batch)} pesagens (tentativa {attempt}), "
+                f"nova tentativa em {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+            attempt += 1
+
+
+async def metrics_worker(buffer: Buffer):
+    """Registra as métricas periodicamente, mesmo sem pesagens chegando (ex: dispositivos desconectados)."""
+    while True:
+        try:
+            await asyncio.sleep(METRICS_INTERVAL)
+            log_metrics(buffer)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Erro ao registrar métricas: {e}")
+
 
 async def weight_worker(buffer: Buffer):
     logger.info("Worker de pesagem iniciado.")
@@ -18,8 +103,8 @@ async def weight_worker(buffer: Buffer):
             if not batch:
                 continue
 
-            # Envia o lote para o banco
-            await PesagemRepository.insert_many(batch)
+            # Envia o lote para o banco (com retry: o lote não é descartado em caso de erro)
+            await store_batch(batch)
 
             logger.debug(
                 f"Batch de {len(batch)} itens processado com sucesso.")
@@ -0,0 +1,77 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem, sem dependências: uma thread lê as pilhas de
+    todas as threads do processo (sys._current_frames) a cada `interval`
+    segundos. O resultado sai no formato "collapsed stacks"
+    (`frame;frame;frame contagem`), aceito por flamegraph.pl e speedscope.
+    """
+
+    # Um profiling por processo de cada vez
+    _lock = threading.Lock()
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self, ignore: set[int]) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in ignore:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self, ignore: set[int]) -> None:
+        ignore = ignore | {threading.get_ident()}
+        while not self._stop.wait(self.interval):
+            self._sample(ignore)
+
+    def start(self, ignore: set[int] | None = None) -> None:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Já existe um profiling em andamento neste processo")
+
+        self._thread = threading.Thread(
+            target=self._run, args=(ignore or set(),), name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._lock.release()
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common())
+
+
+def profile_for(duration: float, interval: float = 0.005) -> str:
+    """
+    Amostra o processo por `duration` segundos e retorna as pilhas agregadas.
+    Bloqueante: em código async use `asyncio.to_thread`; a thread chamadora
+    (apenas aguardando) é excluída do resultado.
+    """
+    profiler = SamplingProfiler(interval)
+    profiler.start(ignore={threading.get_ident()})
+    try:
+        time.sleep(duration)
+    finally:
+        result = profiler.stop()
+    return result